@@ -0,0 +1,43 @@
+"""partial indexes for active rows
+
+Revision ID: 4e7c2b9d85a1
+Revises: c81e5d3f0a62
+Create Date: 2026-10-17 16:10:19.552804
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e7c2b9d85a1'
+down_revision: Union[str, None] = 'c81e5d3f0a62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Keyset indexes that every caller queries with is_active = true; rebuilt as partial indexes
+PARTIAL_INDEXES = [
+    ('ix_order_created_at_id', 'order', ['created_at', 'id']),
+    ('ix_order_user_id_created_at_id', 'order', ['user_id', 'created_at', 'id']),
+    ('ix_order_branch_id_created_at_id', 'order', ['branch_id', 'created_at', 'id']),
+    ('ix_user_created_at_id', 'user', ['created_at', 'id']),
+    ('ix_company_created_at_id', 'company', ['created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in PARTIAL_INDEXES:
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, columns, unique=False, postgresql_where=sa.text('is_active'))
+    op.create_index('ix_menu_branch_id_created_at_id', 'menu', ['branch_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_menu_item_menu_id_active', 'menu_item', ['menu_id'], unique=False, postgresql_where=sa.text('is_active'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_menu_item_menu_id_active', table_name='menu_item')
+    op.drop_index('ix_menu_branch_id_created_at_id', table_name='menu')
+    for name, table, columns in reversed(PARTIAL_INDEXES):
+        op.drop_index(name, table_name=table)
+        op.create_index(name, table, columns, unique=False)
@@ -1,4 +1,9 @@
-from core.security import create_access_token, login_for_access_token, verify_password
+from core.security import (
+    create_user_access_token,
+    login_for_access_token,
+    schedule_password_rehash,
+    verify_password_async,
+)
 from db.session import get_pg_db
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
@@ -14,9 +19,10 @@ router = APIRouter()
 async def login(form: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_pg_db)):
     result = await db.execute(select(User).where(User.email == form.username))
     user: User | None = result.scalar_one_or_none()
-    if not user or not verify_password(form.password, user.hashed_password):
+    if not user or not await verify_password_async(form.password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect email or password")
-    access_token = create_access_token({"sub": str(user.id)})
+    schedule_password_rehash(user.id, form.password, user.hashed_password)
+    access_token = create_user_access_token(user)
     return {"access_token": access_token, "token_type": "bearer"}
 
 
@@ -7,7 +7,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from models.authorization import VerificationCode
 from models.user import User
 from schemas.tasks import CleanupRequest, CleanupResponse, CleanupStats, CleanupType
-from services.cleanup_service import _cleanup_expired_codes_api, _cleanup_unverified_users_api
+from services.cleanup_service import (
+    _cleanup_expired_codes_api,
+    _cleanup_expired_idempotency_keys_api,
+    _cleanup_unverified_users_api,
+)
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from utils.log import timeit
@@ -84,12 +88,16 @@ async def execute_cleanup(
             result = await _cleanup_unverified_users_api(db, payload)
         elif payload.cleanup_type == CleanupType.EXPIRED_CODES:
             result = await _cleanup_expired_codes_api(db, payload)
+        elif payload.cleanup_type == CleanupType.IDEMPOTENCY_KEYS:
+            result = await _cleanup_expired_idempotency_keys_api(db, payload)
         elif payload.cleanup_type == CleanupType.ALL:
             users_result = await _cleanup_unverified_users_api(db, payload)
             codes_result = await _cleanup_expired_codes_api(db, payload)
+            keys_result = await _cleanup_expired_idempotency_keys_api(db, payload)
             result = {
                 "deleted_users": users_result["deleted_users"],
                 "deleted_codes": codes_result["deleted_codes"],
+                "deleted_idempotency_keys": keys_result["deleted_idempotency_keys"],
                 "processed_users": users_result["processed_users"],
             }
         else:
@@ -99,7 +107,11 @@ async def execute_cleanup(
         execution_time = (end_time - start_time).total_seconds()
 
         action = "Would delete" if payload.dry_run else "Deleted"
-        message = f"{action} {result['deleted_users']} users and {result['deleted_codes']} codes"
+        deleted_keys = result.get("deleted_idempotency_keys", 0)
+        message = (
+            f"{action} {result['deleted_users']} users, {result['deleted_codes']} codes "
+            f"and {deleted_keys} idempotency keys"
+        )
 
         logger.info(
             # f"Cleanup executed by admin {current_user.username}: "
@@ -112,6 +124,7 @@ async def execute_cleanup(
             dry_run=payload.dry_run,
             deleted_users=result["deleted_users"],
             deleted_codes=result["deleted_codes"],
+            deleted_idempotency_keys=deleted_keys,
             processed_users=result["processed_users"],
             execution_time=execution_time,
             message=message,
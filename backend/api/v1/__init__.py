@@ -1,4 +1,4 @@
-from api.v1 import authorization, basket, branch, company, menu, menu_item, order, user
+from api.v1 import admin, authorization, basket, branch, company, menu, menu_item, order, user
 from fastapi import APIRouter
 
 router_v1 = APIRouter(prefix="/v1")
@@ -11,4 +11,5 @@ router_v1.include_router(menu.router, prefix="/menus", tags=["Menus"])
 router_v1.include_router(menu_item.router, prefix="/menu-items", tags=["Menu Items"])
 router_v1.include_router(basket.router, prefix="/baskets", tags=["Baskets"])
 router_v1.include_router(order.router, prefix="/orders", tags=["Orders"])
+router_v1.include_router(admin.router, prefix="/admin", tags=["Admin"])
 # router_v1.include_router(payment.router,       prefix="/payments",      tags=["Payments"])
@@ -0,0 +1,41 @@
+from typing import Optional
+
+from dependencies.auth import require_admin
+from fastapi import APIRouter, Depends, Query, status
+from schemas.admin import ProfilesResponse, ProfilingStart, ProfilingStatus, TimingsResponse
+from schemas.token import Principal
+from services.profiler import request_profiler
+from utils.log import timings
+
+router = APIRouter(prefix="", tags=["Admin"])
+
+
+@router.get("/timings", response_model=TimingsResponse)
+async def get_timings(current_user: Principal = Depends(require_admin)):
+    return {"functions": timings.snapshot()}
+
+
+@router.delete("/timings", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_timings(current_user: Principal = Depends(require_admin)):
+    timings.reset()
+
+
+@router.post("/profiling", response_model=ProfilingStatus)
+async def start_profiling(data: ProfilingStart, current_user: Principal = Depends(require_admin)):
+    request_profiler.start(data.sample_rate, data.path_prefix, data.max_requests)
+    return request_profiler.status()
+
+
+@router.get("/profiling", response_model=ProfilesResponse)
+async def get_profiles(
+    path: Optional[str] = Query(None, description="Only return profiles whose path starts with this prefix"),
+    current_user: Principal = Depends(require_admin),
+):
+    return {"status": request_profiler.status(), "profiles": request_profiler.collected(path)}
+
+
+@router.delete("/profiling", response_model=ProfilingStatus)
+async def stop_profiling(current_user: Principal = Depends(require_admin)):
+    request_profiler.stop()
+    request_profiler.clear()
+    return request_profiler.status()
@@ -1,6 +1,6 @@
 import re
 
-from core.security import create_access_token
+from core.security import create_user_access_token
 from crud.authorization import create_public_user, generate_and_send_code, verify_code
 from db.session import get_pg_db
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -63,6 +63,6 @@ async def verify_login_code(payload: VerifyCodeRequest, db: AsyncSession = Depen
     await db.commit()
     await db.refresh(user)
 
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_user_access_token(user)
 
     return TokenResponse(access_token=access_token, user=UserInDB.model_validate(user))
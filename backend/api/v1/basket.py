@@ -3,15 +3,25 @@ from crud.basket import (
     create_basket,
     delete_basket,
     get_basket,
+    get_basket_summary,
     get_baskets,
+    sync_basket,
     update_basket,
     update_patch_basket,
 )
-from db.session import get_pg_db
+from db.session import get_pg_db, get_read_db
 from dependencies.auth import get_current_user
-from fastapi import APIRouter, Depends, Query, status
-from models.user import User
-from schemas.basket import BasketCreateSchema, BasketListResponse, BasketResponse, BasketUpdateSchema
+from fastapi import APIRouter, Depends, Query, Request, status
+from schemas.basket import (
+    BasketBulkSchema,
+    BasketCreateSchema,
+    BasketListResponse,
+    BasketResponse,
+    BasketSummaryResponse,
+    BasketUpdateSchema,
+)
+from schemas.token import Principal
+from services.idempotency import run_idempotent
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -21,25 +31,49 @@ router = APIRouter()
 async def create_basket_endpoint(
     user_id: int,
     payload: BasketCreateSchema,
+    request: Request,
     db: AsyncSession = Depends(get_pg_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return await create_basket(db, payload, user_id)
+    return await run_idempotent(
+        request,
+        db,
+        f"user:{current_user.id}",
+        lambda: create_basket(db, payload, user_id),
+        lambda basket: BasketResponse.model_validate(basket).model_dump_json().encode(),
+        status.HTTP_201_CREATED,
+    )
 
 
 @router.get("/", response_model=BasketListResponse)
 async def list_baskets(
-    db: AsyncSession = Depends(get_pg_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
 ):
     return await get_baskets(db, current_user.id, skip, limit)
 
 
+@router.get("/summary", response_model=BasketSummaryResponse)
+async def basket_summary_endpoint(
+    db: AsyncSession = Depends(get_read_db), current_user: Principal = Depends(get_current_user)
+):
+    return await get_basket_summary(db, current_user.id)
+
+
+@router.put("/bulk", response_model=BasketListResponse)
+async def sync_basket_endpoint(
+    payload: BasketBulkSchema,
+    db: AsyncSession = Depends(get_pg_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    return await sync_basket(db, payload, current_user.id)
+
+
 @router.get("/{basket_id}", response_model=BasketResponse)
 async def get_basket_endpoint(
-    basket_id: int, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(get_current_user)
+    basket_id: int, db: AsyncSession = Depends(get_read_db), current_user: Principal = Depends(get_current_user)
 ):
     basket = await get_basket(db, basket_id)
 
@@ -56,25 +90,30 @@ async def update_basket_endpoint(
     basket_id: int,
     payload: BasketUpdateSchema,
     db: AsyncSession = Depends(get_pg_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     return await update_basket(db, basket_id, payload, current_user.id)
 
 
 @router.patch("/{basket_id}", response_model=BasketResponse)
 async def patch_basket_endpoint(
-    basket_id: int, quantity: int, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(get_current_user)
+    basket_id: int,
+    quantity: int,
+    db: AsyncSession = Depends(get_pg_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     return await update_patch_basket(db, basket_id, quantity, current_user.id)
 
 
 @router.delete("/{basket_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_basket_endpoint(
-    basket_id: int, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(get_current_user)
+    basket_id: int, db: AsyncSession = Depends(get_pg_db), current_user: Principal = Depends(get_current_user)
 ):
     await delete_basket(db, basket_id, current_user.id)
 
 
 @router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
-async def clear_basket_endpoint(db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(get_current_user)):
+async def clear_basket_endpoint(
+    db: AsyncSession = Depends(get_pg_db), current_user: Principal = Depends(get_current_user)
+):
     await clear_user_basket(db, current_user.id)
@@ -1,17 +1,25 @@
+from typing import List
+
 from crud.branch import create_branch, delete_branch, get_branch, update_owner_role_branch
-from db.session import get_pg_db
+from crud.menu import get_branch_catalog
+from db.session import get_pg_db, get_read_db
 from dependencies.auth import get_current_user, require_admin_or_company
-from fastapi import APIRouter, Depends, status
-from models import User
+from fastapi import APIRouter, Depends, Request, Response, status
 from schemas.branch import BranchCreate, BranchInDb
+from schemas.menu import MenuCatalogResponse
+from schemas.token import Principal
+from services.menu_cache import branch_catalog_key, catalog_rows, get_or_load, serialize_catalog
 from sqlalchemy.ext.asyncio import AsyncSession
+from utils.http import conditional_json_response, etag_headers, etag_matches, make_etag, not_modified
 
 router = APIRouter(prefix="", tags=["Branches"])
 
 
 @router.post("/", response_model=BranchInDb, status_code=status.HTTP_201_CREATED)
 async def create_branch_endpoint(
-    data: BranchCreate, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(require_admin_or_company)
+    data: BranchCreate,
+    db: AsyncSession = Depends(get_pg_db),
+    current_user: Principal = Depends(require_admin_or_company),
 ):
     #     branch = await create_branch(db, data)
     #     return BranchInDb.from_orm(branch)
@@ -22,7 +30,7 @@ async def create_branch_endpoint(
 async def add_owner_branch(
     branch_id: int,
     owner_id: int,
-    current_user: User = Depends(require_admin_or_company),
+    current_user: Principal = Depends(require_admin_or_company),
     db: AsyncSession = Depends(get_pg_db),
 ):
     return await update_owner_role_branch(branch_id, owner_id, db)
@@ -30,13 +38,35 @@ async def add_owner_branch(
 
 @router.get("/{branch_id}", response_model=BranchInDb)
 async def get_branch_endpoint(
-    branch_id: int, current_user: User = Depends(get_current_user), db: AsyncSession = Depends(get_pg_db)
+    branch_id: int,
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    branch = await get_branch(branch_id, db)
+    etag = make_etag(branch)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return branch
+
+
+@router.get("/{branch_id}/catalog", response_model=List[MenuCatalogResponse])
+async def get_branch_catalog_endpoint(
+    branch_id: int,
+    request: Request,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_pg_db),
 ):
-    return await get_branch(branch_id, db)
+    payload = await get_or_load(
+        branch_catalog_key(branch_id), lambda: get_branch_catalog(db, branch_id), serialize_catalog, catalog_rows
+    )
+    return conditional_json_response(request, payload.etag, payload.body, payload.encoded)
 
 
 @router.delete("/{branch_id}")
 async def delete_branch_endpoint(
-    branch_id: int, current_user: User = Depends(require_admin_or_company), db: AsyncSession = Depends(get_pg_db)
+    branch_id: int, current_user: Principal = Depends(require_admin_or_company), db: AsyncSession = Depends(get_pg_db)
 ):
     return await delete_branch(branch_id, db)
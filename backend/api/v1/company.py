@@ -1,38 +1,68 @@
-from crud.company import create_company, delete_company, get_company, update_company_owner
-from db.session import get_pg_db
+from typing import List, Optional
+
+from crud.company import create_company, delete_company, get_companies, get_company, update_company_owner
+from db.session import get_pg_db, get_read_db
 from dependencies.auth import require_admin, require_admin_or_company
-from fastapi import APIRouter, Depends, status
-from models import User
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from schemas.company import CompanyCreate, CompanyInDB
+from schemas.token import Principal
 from sqlalchemy.ext.asyncio import AsyncSession
+from utils.http import etag_headers, etag_matches, make_etag, not_modified
 
 router = APIRouter(prefix="", tags=["Companies"])
 
 
 @router.post("/", response_model=CompanyInDB, status_code=status.HTTP_201_CREATED)
 async def create_company_endpoint(
-    data: CompanyCreate, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(require_admin)
+    data: CompanyCreate, db: AsyncSession = Depends(get_pg_db), current_user: Principal = Depends(require_admin)
 ):
     company = await create_company(db, data)
     return CompanyInDB.from_orm(company)
 
 
+@router.get("/", response_model=List[CompanyInDB])
+async def list_companies_endpoint(
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    current_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_read_db),
+):
+    companies, next_cursor = await get_companies(db, skip, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return companies
+
+
 @router.patch("/{company_id}", response_model=CompanyInDB, status_code=status.HTTP_200_OK)
 async def add_owner_company(
-    company_id: int, owner_id: int, current_user: User = Depends(require_admin), db: AsyncSession = Depends(get_pg_db)
+    company_id: int,
+    owner_id: int,
+    current_user: Principal = Depends(require_admin),
+    db: AsyncSession = Depends(get_pg_db),
 ):
     return await update_company_owner(db, company_id, owner_id)
 
 
 @router.get("/{company_id}", response_model=CompanyInDB)
 async def get_company_endpoint(
-    company_id: int, current_user: User = Depends(require_admin_or_company), db: AsyncSession = Depends(get_pg_db)
+    company_id: int,
+    request: Request,
+    response: Response,
+    current_user: Principal = Depends(require_admin_or_company),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    return await get_company(db, company_id)
+    company = await get_company(db, company_id)
+    etag = make_etag(company)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+    return company
 
 
 @router.delete("/{company_id}")
 async def delete_company_endpoint(
-    company_id: int, current_user: User = Depends(require_admin_or_company), db: AsyncSession = Depends(get_pg_db)
+    company_id: int, current_user: Principal = Depends(require_admin_or_company), db: AsyncSession = Depends(get_pg_db)
 ):
     return await delete_company(db, company_id)
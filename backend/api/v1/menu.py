@@ -9,41 +9,59 @@ from crud.menu import (
     patch_menu,
     update_menu,
 )
-from db.session import get_pg_db
+from db.session import get_pg_db, get_read_db
 from dependencies.auth import get_current_user, require_company_or_branch
-from fastapi import APIRouter, Depends, Query, status
-from models import User
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from schemas.menu import MenuCreate, MenuPatch, MenuResponse, MenuUpdate
+from schemas.token import Principal
+from services.menu_cache import branch_menus_key, get_or_load, menu_key, serialize_menu, serialize_menus
 from sqlalchemy.ext.asyncio import AsyncSession
+from utils.http import conditional_json_response
 
 router = APIRouter()
 
 
 @router.post("/", response_model=MenuResponse, status_code=status.HTTP_201_CREATED)
 async def create_menu_endpoint(
-    data: MenuCreate, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(require_company_or_branch)
+    data: MenuCreate,
+    db: AsyncSession = Depends(get_pg_db),
+    current_user: Principal = Depends(require_company_or_branch),
 ):
     return await create_menu(db, data)
 
 
 @router.get("/", response_model=List[MenuResponse])
 async def get_menus_endpoint(
+    request: Request,
+    response: Response,
     branch_id: Optional[int] = Query(None, description="Filter by branch ID"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
-    db: AsyncSession = Depends(get_pg_db),
-    current_user: User = Depends(require_company_or_branch),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_read_db),
+    primary_db: AsyncSession = Depends(get_pg_db),
+    current_user: Principal = Depends(require_company_or_branch),
 ):
     if branch_id:
-        return await get_menu_by_branch(db, branch_id)
-    return await get_menus_paginated(db, skip=skip, limit=limit)
+        payload = await get_or_load(
+            branch_menus_key(branch_id), lambda: get_menu_by_branch(primary_db, branch_id), serialize_menus
+        )
+        return conditional_json_response(request, payload.etag, payload.body, payload.encoded)
+    menus, next_cursor = await get_menus_paginated(db, skip=skip, limit=limit, cursor=cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return menus
 
 
 @router.get("/{menu_id}", response_model=MenuResponse)
 async def get_menu_endpoint(
-    menu_id: int, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(get_current_user)
+    menu_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_pg_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return await get_menu(db, menu_id)
+    payload = await get_or_load(menu_key(menu_id), lambda: get_menu(db, menu_id), serialize_menu)
+    return conditional_json_response(request, payload.etag, payload.body, payload.encoded)
 
 
 @router.put("/{menu_id}", response_model=MenuResponse)
@@ -51,7 +69,7 @@ async def update_menu_endpoint(
     menu_id: int,
     data: MenuUpdate,
     db: AsyncSession = Depends(get_pg_db),
-    current_user: User = Depends(require_company_or_branch),
+    current_user: Principal = Depends(require_company_or_branch),
 ):
     return await update_menu(db, menu_id, data)
 
@@ -61,14 +79,14 @@ async def patch_menu_endpoint(
     menu_id: int,
     data: MenuPatch,
     db: AsyncSession = Depends(get_pg_db),
-    current_user: User = Depends(require_company_or_branch),
+    current_user: Principal = Depends(require_company_or_branch),
 ):
     return await patch_menu(db, menu_id, data)
 
 
 @router.delete("/{menu_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_menu_endpoint(
-    menu_id: int, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(require_company_or_branch)
+    menu_id: int, db: AsyncSession = Depends(get_pg_db), current_user: Principal = Depends(require_company_or_branch)
 ):
     await delete_menu(db, menu_id)
     return None
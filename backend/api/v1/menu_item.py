@@ -1,26 +1,34 @@
 from crud.menu_item import create_menu_item, delete_menu_item, get_menu_item, patch_menu_item, update_menu_item
 from db.session import get_pg_db
 from dependencies.auth import get_current_user, require_branch
-from fastapi import APIRouter, Depends, status
-from models import User
+from fastapi import APIRouter, Depends, Request, status
 from schemas.menu_item import MenuItemCreate, MenuItemResponse, MenuItemUpdate
+from schemas.token import Principal
+from services.menu_cache import get_or_load, menu_item_key, serialize_menu_item
 from sqlalchemy.ext.asyncio import AsyncSession
+from utils.http import conditional_json_response
 
 router = APIRouter()
 
 
 @router.post("/create", response_model=MenuItemResponse, status_code=status.HTTP_201_CREATED)
 async def create_menu_item_endpoint(
-    data: MenuItemCreate, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(require_branch)
+    data: MenuItemCreate, db: AsyncSession = Depends(get_pg_db), current_user: Principal = Depends(require_branch)
 ):
     return await create_menu_item(db, data, current_user.id)
 
 
 @router.get("/{menu_item_id}", response_model=MenuItemResponse, status_code=status.HTTP_200_OK)
 async def get_menu_item_endpoint(
-    menu_item_id: int, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(get_current_user)
+    menu_item_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_pg_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return await get_menu_item(db, menu_item_id)
+    payload = await get_or_load(
+        menu_item_key(menu_item_id), lambda: get_menu_item(db, menu_item_id), serialize_menu_item
+    )
+    return conditional_json_response(request, payload.etag, payload.body, payload.encoded)
 
 
 @router.put("/{menu_item_id}", response_model=MenuItemResponse, status_code=status.HTTP_200_OK)
@@ -28,7 +36,7 @@ async def update_menu_item_endpoint(
     menu_item_id: int,
     data: MenuItemUpdate,
     db: AsyncSession = Depends(get_pg_db),
-    current_user: User = Depends(require_branch),
+    current_user: Principal = Depends(require_branch),
 ):
     return await update_menu_item(db, menu_item_id, data, current_user.id)
 
@@ -38,13 +46,13 @@ async def patch_menu_item_endpoint(
     menu_item_id: int,
     data: MenuItemUpdate,
     db: AsyncSession = Depends(get_pg_db),
-    current_user: User = Depends(require_branch),
+    current_user: Principal = Depends(require_branch),
 ):
     return await patch_menu_item(db, menu_item_id, data, current_user.id)
 
 
 @router.delete("/{menu_item_id}", status_code=status.HTTP_200_OK)
 async def delete_menu_item_endpoint(
-    menu_item_id: int, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(require_branch)
+    menu_item_id: int, db: AsyncSession = Depends(get_pg_db), current_user: Principal = Depends(require_branch)
 ):
     return await delete_menu_item(db, menu_item_id, current_user.id)
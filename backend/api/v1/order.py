@@ -1,12 +1,13 @@
-from typing import Optional
+from typing import Literal, Optional
 
 from crud.order import create_order, delete_order, get_order, get_orders, update_order
-from db.session import get_pg_db
+from db.session import get_pg_db, get_read_db
 from dependencies.auth import get_current_user
-from fastapi import APIRouter, Body, Depends, Path, Query, status
+from fastapi import APIRouter, Body, Depends, Path, Query, Request, status
 from models.order import OrderStatus
-from models.user import User
 from schemas.order import OrderCreate, OrderResponse, OrdersResponse, OrderUpdate
+from schemas.token import Principal
+from services.idempotency import run_idempotent
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -14,9 +15,19 @@ router = APIRouter()
 
 @router.post("/create", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
 async def create_order_endpoint(
-    payload: OrderCreate, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(get_current_user)
+    payload: OrderCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_pg_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return await create_order(db, payload)
+    return await run_idempotent(
+        request,
+        db,
+        f"user:{current_user.id}",
+        lambda: create_order(db, payload),
+        lambda order: OrderResponse.model_validate(order).model_dump_json().encode(),
+        status.HTTP_201_CREATED,
+    )
 
 
 @router.get("/", response_model=OrdersResponse)
@@ -25,17 +36,21 @@ async def get_orders_endpoint(
     branch_id: Optional[int] = Query(None, description="Filter by branch ID"),
     skip: int = Query(0, ge=0, description="Number of orders to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of orders to return"),
-    db: AsyncSession = Depends(get_pg_db),
-    current_user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    count: Optional[Literal["exact", "cached", "estimated", "none"]] = Query(
+        None, description="How to compute total_count; 'none' skips counting and relies on has_more"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
-    return await get_orders(db, user_id, branch_id, skip, limit)
+    return await get_orders(db, user_id, branch_id, skip, limit, cursor, count)
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order_endpoint(
     order_id: int = Path(..., gt=0),
-    db: AsyncSession = Depends(get_pg_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
 ):
     return await get_order(db, order_id, current_user.id)
 
@@ -45,7 +60,7 @@ async def update_order_endpoint(
     order_id: int = Path(..., gt=0),
     payload: OrderUpdate = Body(...),
     db: AsyncSession = Depends(get_pg_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     return await update_order(db, order_id, payload, current_user.id)
 
@@ -54,6 +69,6 @@ async def update_order_endpoint(
 async def delete_order_endpoint(
     order_id: int = Path(..., gt=0),
     db: AsyncSession = Depends(get_pg_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     return await delete_order(db, order_id, current_user.id)
@@ -1,4 +1,4 @@
-from dependencies.auth import get_current_user
+from dependencies.auth import get_current_db_user
 from fastapi import APIRouter, Depends
 from models import User
 
@@ -6,7 +6,7 @@ router = APIRouter()
 
 
 @router.get("/me")
-async def read_me(current_user: User = Depends(get_current_user)):
+async def read_me(current_user: User = Depends(get_current_db_user)):
     return {
         "id": current_user.id,
         "username": current_user.username,
@@ -1,10 +1,11 @@
-from typing import List
+from typing import List, Optional
 
 from crud.user import create_user, delete_user, get_user, get_users, update_user, update_user_role
-from db.session import get_pg_db
-from dependencies.auth import check_assign_permission, get_current_user, require_admin
-from fastapi import APIRouter, Depends, Path, status
+from db.session import get_pg_db, get_read_db
+from dependencies.auth import check_assign_permission, get_current_db_user, get_current_user, require_admin
+from fastapi import APIRouter, Depends, Path, Query, Response, status
 from models import User
+from schemas.token import Principal
 from schemas.user import UserCreate, UserInDB, UserRoleUpdate, UserUpdate
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -13,24 +14,34 @@ router = APIRouter()
 
 @router.post("/create", response_model=UserInDB, status_code=status.HTTP_201_CREATED)
 async def create_user_endpoint(
-    payload: UserCreate, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(require_admin)
+    payload: UserCreate, db: AsyncSession = Depends(get_pg_db), current_user: Principal = Depends(require_admin)
 ):
     return await create_user(db, payload)
 
 
 @router.get("/me", response_model=UserInDB)
-async def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_db_user)):
     return current_user
 
 
 @router.get("/list_users", response_model=List[UserInDB])
-async def list_users(db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(get_current_user)):
-    return await get_users(db)
+async def list_users(
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_user),
+):
+    users, next_cursor = await get_users(db, skip, limit, cursor)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return users
 
 
 @router.get("/get_user/{user_id}", response_model=UserInDB)
 async def get_user_endpoint(
-    user_id: int, db: AsyncSession = Depends(get_pg_db), current_user: User = Depends(require_admin)
+    user_id: int, db: AsyncSession = Depends(get_read_db), current_user: Principal = Depends(require_admin)
 ):
     return await get_user(db, user_id)
 
@@ -39,7 +50,7 @@ async def get_user_endpoint(
 async def update_user_endpoint(
     user_id: int,
     user: UserUpdate,
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
     db: AsyncSession = Depends(get_pg_db),
 ):
     updated_user = await update_user(db, user_id, user)
@@ -54,7 +65,7 @@ async def update_user_endpoint(
 async def patch_user_role(
     user_id: int = Path(..., ge=1),
     payload: UserRoleUpdate = Depends(),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
     db: AsyncSession = Depends(get_pg_db),
 ):
     check_assign_permission(payload.role, current_user)
@@ -64,7 +75,7 @@ async def patch_user_role(
 @router.delete("/delete/{user_id}", status_code=204)
 async def delete_user_endpoint(
     user_id: int,
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
     db: AsyncSession = Depends(get_pg_db),
 ):
     await delete_user(db, user_id)
@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+async def _wait_ready(base_url: str, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/livez")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"server at {base_url} did not come up within {timeout}s")
+
+
+async def load(base_url: str, path: str, concurrency: int, duration: float, token: str | None) -> dict:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30) as client:
+
+        async def user():
+            nonlocal errors
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.monotonic()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    latencies.sort()
+
+    def percentile(q: float) -> float:
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "errors": errors,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+    }
+
+
+def _start_gunicorn(workers: int, port: int) -> subprocess.Popen:
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "BIND": f"127.0.0.1:{port}"}
+    return subprocess.Popen(
+        ["gunicorn", "-c", "gunicorn.conf.py", "main:app"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def run(args) -> None:
+    if not args.workers:
+        result = await load(args.url, args.path, args.concurrency, args.duration, args.token)
+        _print(args.url, result)
+        return
+
+    # Start a local gunicorn per worker count against the configured database and load the same path
+    for workers in args.workers:
+        process = _start_gunicorn(workers, args.port)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            await _wait_ready(base_url, timeout=30)
+            await load(base_url, args.path, args.concurrency, 2, args.token)  # warm up pools and caches
+            result = await load(base_url, args.path, args.concurrency, args.duration, args.token)
+            _print(f"{workers} worker(s)", result)
+        finally:
+            process.send_signal(signal.SIGTERM)
+            process.wait(timeout=60)
+
+
+def _print(label: str, result: dict) -> None:
+    print(
+        f"{label:>14}: {result['rps']:8.0f} req/s  p50 {result['p50_ms']:6.1f} ms  "
+        f"p99 {result['p99_ms']:6.1f} ms  errors {result['errors']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTTP load test; with --workers, compares gunicorn worker counts")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Target when --workers is not given")
+    parser.add_argument("--path", default="/livez")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--token", help="Bearer token for authenticated paths such as /api/v1/orders/")
+    parser.add_argument("--workers", type=int, nargs="*", help="e.g. --workers 1 2 4")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+import sys
+import time
+
+from core.middleware import MetricsMiddleware
+from services.metrics import request_metrics
+from starlette.routing import Route
+
+ROUTES = [Route(path, lambda request: None) for path in ("/api/v1/orders/", "/api/v1/menus/{menu_id}", "/ping")]
+
+
+async def _endpoint(scope, receive, send):
+    scope["route"] = ROUTES[len(scope["path"]) % len(ROUTES)]
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def _per_request_us(app, requests: int) -> float:
+    started = time.perf_counter()
+    for i in range(requests):
+        await app({"type": "http", "method": "GET", "path": "/x" * (i % 3 + 1)}, _receive, _send)
+    return (time.perf_counter() - started) * 1e6 / requests
+
+
+async def run(requests: int, rounds: int) -> float:
+    wrapped = MetricsMiddleware(_endpoint)
+    overheads = []
+    for _ in range(rounds):
+        bare = await _per_request_us(_endpoint, requests)
+        instrumented = await _per_request_us(wrapped, requests)
+        overheads.append(instrumented - bare)
+        print(f"bare {bare:6.2f} us/request, with metrics {instrumented:6.2f} us/request")
+    request_metrics.reset()
+    return sorted(overheads)[len(overheads) // 2]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the per-request cost of MetricsMiddleware")
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget-us", type=float, default=20.0, help="Exit non-zero if the median overhead exceeds it")
+    args = parser.parse_args()
+
+    overhead = asyncio.run(run(args.requests, args.rounds))
+    print(f"median metrics overhead: {overhead:.2f} us/request (budget {args.budget_us} us)")
+    if overhead > args.budget_us:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import asyncio
+import time
+
+from db.base import Base
+from models.order import Order
+from models.user import UserRole
+from services.order import create_order_id_generator
+from sqlalchemy import delete, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from tests.conftest import seed_branch
+
+
+async def _seed(session_factory) -> tuple[int, int]:
+    async with session_factory() as db:
+        seed = await seed_branch(db, "bench", role=UserRole.branch)
+        return seed.owner.id, seed.branch.id
+
+
+async def benchmark(session_factory, strategy: str, orders: int, user_id: int, branch_id: int) -> None:
+    generate = create_order_id_generator(strategy, node_id=1)
+    collisions = 0
+    started = time.perf_counter()
+    async with session_factory() as db:
+        for _ in range(orders):
+            try:
+                await db.execute(
+                    insert(Order).values(username=generate(), user_id=user_id, branch_id=branch_id, total_amount=0)
+                )
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+                collisions += 1
+        elapsed = time.perf_counter() - started
+        await db.execute(delete(Order).where(Order.user_id == user_id))
+        await db.commit()
+    print(f"{strategy:>9}: {orders / elapsed:8.0f} inserts/s, {collisions} unique-constraint collisions")
+
+
+async def run(url: str, orders: int, strategies: list[str]) -> None:
+    engine = create_async_engine(url)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        user_id, branch_id = await _seed(session_factory)
+        for strategy in strategies:
+            await benchmark(session_factory, strategy, orders, user_id, branch_id)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare order insert throughput across order id strategies")
+    parser.add_argument(
+        "--url", default="sqlite+aiosqlite:///order_benchmark.db", help="Scratch database; seed rows are left in it"
+    )
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--strategy", choices=["snowflake", "ulid", "legacy"], action="append")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.url, args.orders, args.strategy or ["legacy", "snowflake", "ulid"]))
+
+
+if __name__ == "__main__":
+    main()
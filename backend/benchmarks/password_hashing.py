@@ -0,0 +1,84 @@
+import argparse
+import time
+
+from passlib.context import CryptContext
+
+
+def _verify_ms(context: CryptContext, samples: int) -> float:
+    hashed = context.hash("benchmark-password")
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        context.verify("benchmark-password", hashed)
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def benchmark_bcrypt(target_ms: float, samples: int) -> int | None:
+    best = None
+    for rounds in range(8, 17):
+        elapsed = _verify_ms(CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds), samples)
+        print(f"bcrypt rounds={rounds}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = rounds
+    return best
+
+
+def benchmark_argon2(target_ms: float, samples: int, memory_cost: int, parallelism: int) -> int | None:
+    best = None
+    for time_cost in range(1, 11):
+        context = CryptContext(
+            schemes=["argon2"],
+            argon2__type="ID",
+            argon2__memory_cost=memory_cost,
+            argon2__time_cost=time_cost,
+            argon2__parallelism=parallelism,
+        )
+        elapsed = _verify_ms(context, samples)
+        print(f"argon2id m={memory_cost}KiB t={time_cost} p={parallelism}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        best = time_cost
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pick password hash costs that keep a verify under a target latency")
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2", "all"], default="all")
+    parser.add_argument("--argon2-memory-cost", type=int, default=65536)
+    parser.add_argument("--argon2-parallelism", type=int, default=4)
+    args = parser.parse_args()
+
+    suggestions = []
+    if args.scheme in ("bcrypt", "all"):
+        rounds = benchmark_bcrypt(args.target_ms, args.samples)
+        if rounds is None:
+            print(f"bcrypt with 8 rounds already exceeds {args.target_ms} ms")
+        else:
+            suggestions.append(f"BCRYPT_ROUNDS={rounds}")
+
+    if args.scheme in ("argon2", "all"):
+        try:
+            time_cost = benchmark_argon2(args.target_ms, args.samples, args.argon2_memory_cost, args.argon2_parallelism)
+        except Exception as e:
+            print(f"argon2 unavailable: {e}")
+        else:
+            if time_cost is None:
+                print(f"argon2id with {args.argon2_memory_cost}KiB exceeds {args.target_ms} ms, lower the memory cost")
+            else:
+                suggestions += [
+                    f"ARGON2_MEMORY_COST={args.argon2_memory_cost}",
+                    f"ARGON2_TIME_COST={time_cost}",
+                    f"ARGON2_PARALLELISM={args.argon2_parallelism}",
+                ]
+
+    print(f"\nSuggested settings for a verify under {args.target_ms} ms:")
+    for line in suggestions:
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
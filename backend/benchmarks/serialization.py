@@ -0,0 +1,91 @@
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import models  # noqa: F401  registers every mapper before the ORM objects below are built
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from models.menu import MenuItem
+from models.order import Order, OrderItem, OrderStatus
+from schemas.order import OrdersResponse
+
+
+def _build_page(orders: int, items_per_order: int) -> dict:
+    now = datetime.now(timezone.utc)
+    menu_items = [
+        MenuItem(
+            id=i,
+            username=f"item-{i}",
+            description="Double shot with steamed milk",
+            price=350 + i,
+            is_available=True,
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, 21)
+    ]
+    page = []
+    for order_id in range(1, orders + 1):
+        order = Order(
+            id=order_id,
+            username=f"order#{order_id:019d}",
+            user_id=7,
+            branch_id=3,
+            total_amount=1200,
+            status=OrderStatus.PENDING,
+            created_at=now,
+            updated_at=now,
+            delivery_address="12 Market Street",
+        )
+        order.order_items = [
+            OrderItem(
+                id=order_id * 10 + n,
+                menu_item_id=menu_items[n % 20].id,
+                quantity=2,
+                price=400,
+                total_price=800,
+                is_active=True,
+                menu_item=menu_items[n % 20],
+            )
+            for n in range(items_per_order)
+        ]
+        page.append(order)
+    return {"orders": page, "total_count": orders, "has_more": False, "skip": 0, "limit": orders, "next_cursor": None}
+
+
+async def _fastapi_default(field, page, response_class) -> bytes:
+    content = await serialize_response(field=field, response_content=page, is_coroutine=True)
+    return response_class(content).body
+
+
+async def run(orders: int, items_per_order: int, rounds: int) -> None:
+    page = _build_page(orders, items_per_order)
+    field = create_response_field(name="Response_get_orders", type_=OrdersResponse)
+    candidates = {
+        "response_model + JSONResponse": lambda: _fastapi_default(field, page, JSONResponse),
+        "response_model + ORJSONResponse": lambda: _fastapi_default(field, page, ORJSONResponse),
+    }
+    for label, render in candidates.items():
+        timings = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            body = await render()
+            timings.append((time.perf_counter() - started) * 1000)
+        print(f"{label:>32}: {sorted(timings)[len(timings) // 2]:7.2f} ms per page ({len(body) / 1024:.0f} KiB)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare response encoding paths on a page of orders")
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=3, help="Order items per order")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.orders, args.items, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import logging
+import time
+
+from db.session import QueryStats, client_key_from_headers, mark_recent_write, query_stats
+from services.health import health_monitor
+from services.metrics import request_metrics
+from services.profiler import request_profiler
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.compression import compress, is_compressible, negotiate_encoding
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["method"] not in SAFE_METHODS:
+            client_key = client_key_from_headers(Headers(scope=scope))
+            if client_key:
+                mark_recent_write(client_key)
+        await self.app(scope, receive, send)
+
+
+class QueryStatsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = query_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", db-slowest;dur={stats.slowest_ms:.1f}',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            query_stats.reset(token)
+            duration_ms = (time.perf_counter() - started) * 1000
+            logger.info(
+                f"{scope['method']} {scope['path']} {status_code} {duration_ms:.1f}ms "
+                f"queries={stats.count} db={stats.total_ms:.1f}ms slowest={stats.slowest_ms:.1f}ms",
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "duration_ms": round(duration_ms, 3),
+                    "db_queries": stats.count,
+                    "db_total_ms": round(stats.total_ms, 3),
+                    "db_slowest_ms": round(stats.slowest_ms, 3),
+                    "db_slowest_statement": stats.slowest_statement,
+                },
+            )
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not request_profiler.should_sample(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        profile = request_profiler.begin()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_profiler.finish(profile, scope["method"], scope["path"], (time.perf_counter() - started) * 1000)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+        request_metrics.in_flight += 1
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_metrics.in_flight -= 1
+            # Label by route template so /orders/{order_id} is one series, and unmatched paths share a single one
+            route = scope.get("route")
+            request_metrics.observe(
+                scope["method"],
+                route.path if route is not None else "unmatched",
+                status_code,
+                time.perf_counter() - started,
+            )
+
+
+class DrainingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            health_monitor.note_request()
+        await self.app(scope, receive, send)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, level: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        start_message: Message | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                # Hold the headers until the first body chunk shows whether compressing is worthwhile
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+            if start_message is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(scope=start_message)
+            response_start, start_message = start_message, None
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if "content-encoding" in headers or not is_compressible(headers.get("content-type", "")):
+                passthrough = True
+                await send(response_start)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            # Streamed responses are sent as-is; every JSON endpoint here returns a single body
+            if encoding is None or more_body or len(body) < self.minimum_size:
+                passthrough = True
+                await send(response_start)
+                await send(message)
+                return
+
+            body = compress(body, encoding, self.level)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            await send(response_start)
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        await self.app(scope, receive, send_compressed)
+        if start_message is not None:
+            await send(start_message)
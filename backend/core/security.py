@@ -1,19 +1,58 @@
+import asyncio
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
 from core.settings import settings
-from db.session import get_pg_db
+from db.session import async_session, get_pg_db
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
+from models import User
 from passlib.context import CryptContext
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession
-
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from utils.cache import TTLCache, create_cache_backend
+
+# The configured scheme hashes new passwords; the other one only verifies and is flagged for rehash
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"] if settings.PASSWORD_HASH_SCHEME == "argon2" else ["bcrypt", "argon2"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    argon2__type="ID",
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
 
 logger = logging.getLogger(__name__)
 
+principal_cache = TTLCache(maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+# Lowest token version still accepted per user, shared through CACHE_REDIS_URL so a revocation reaches every
+# worker. Without Redis it only covers this worker and the others notice once their principal_cache entry expires.
+token_revocations = create_cache_backend(
+    settings.CACHE_REDIS_URL,
+    maxsize=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    prefix="token-version:",
+)
+
+
+def invalidate_principal(user_id: int) -> None:
+    principal_cache.delete(user_id)
+
+
+async def revoke_tokens(user_id: int, token_version: int) -> None:
+    principal_cache.delete(user_id)
+    await token_revocations.set(str(user_id), str(token_version).encode())
+
+
+async def is_token_revoked(user_id: int, token_version: int) -> bool:
+    min_version = await token_revocations.get(str(user_id))
+    return min_version is not None and token_version < int(min_version)
+
 
 def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
@@ -23,6 +62,78 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# bcrypt releases the GIL, so a small thread pool keeps hashing off the event loop
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
+hash_stats = {
+    "in_flight": 0,
+    "rejected": 0,
+    "verify": {"count": 0, "total_ms": 0.0, "max_ms": 0.0},
+    "hash": {"count": 0, "total_ms": 0.0, "max_ms": 0.0},
+}
+
+
+async def _run_hash_job(operation: str, func, *args):
+    if hash_stats["in_flight"] >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE:
+        hash_stats["rejected"] += 1
+        logger.warning(f"Password hash pool saturated, rejecting {operation}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry",
+            headers={"Retry-After": "1"},
+        )
+
+    hash_stats["in_flight"] += 1
+    started = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+    finally:
+        hash_stats["in_flight"] -= 1
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        timing = hash_stats[operation]
+        timing["count"] += 1
+        timing["total_ms"] += elapsed_ms
+        timing["max_ms"] = max(timing["max_ms"], elapsed_ms)
+
+
+async def verify_password_async(plain: str, hashed: str) -> bool:
+    return await _run_hash_job("verify", verify_password, plain, hashed)
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hash_job("hash", get_password_hash, password)
+
+
+_rehash_tasks: set[asyncio.Task] = set()
+
+
+async def _rehash_password(user_id: int, plain: str, old_hash: str) -> None:
+    try:
+        new_hash = await get_password_hash_async(plain)
+        async with async_session() as db:
+            # Skip the write if the password was changed while the new hash was being computed
+            result = await db.execute(
+                update(User)
+                .where(User.id == user_id, User.hashed_password == old_hash)
+                .values(hashed_password=new_hash)
+            )
+            await db.commit()
+        if result.rowcount == 0:
+            logger.info(f"Skipped password rehash for user {user_id}: password changed in the meantime")
+            return
+        logger.info(f"Rehashed password for user {user_id} with current hash profile")
+    except Exception as e:
+        logger.warning(f"Password rehash failed for user {user_id}: {e}")
+
+
+def schedule_password_rehash(user_id: int, plain: str, hashed: str) -> None:
+    if not pwd_context.needs_update(hashed):
+        return
+    task = asyncio.create_task(_rehash_password(user_id, plain, hashed))
+    _rehash_tasks.add(task)
+    task.add_done_callback(_rehash_tasks.discard)
+
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
 
@@ -33,6 +144,10 @@ def create_access_token(data: dict[str, Any], expires_delta: Optional[timedelta]
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+def create_user_access_token(user) -> str:
+    return create_access_token({"sub": str(user.id), "role": user.role.value, "ver": user.token_version})
+
+
 def decode_access_token(token: str) -> dict[str, Any]:
     try:
         return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
@@ -51,9 +166,10 @@ async def authenticate_user(db: AsyncSession, username: str, password: str):
     if not user:
         logger.warning(f"Failed login attempt for username: {username}")
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         logger.warning(f"Wrong password for user: {username}")
         return None
+    schedule_password_rehash(user.id, password, user.hashed_password)
     logger.info(f"Successful login for user: {username}")
     return user
 
@@ -68,5 +184,5 @@ async def login_for_access_token(
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    token = create_access_token({"sub": str(user.id), "role": user.role.value})
+    token = create_user_access_token(user)
     return {"access_token": token, "token_type": "bearer"}
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from uuid import uuid4
 
-from core.security import get_password_hash
+from core.security import get_password_hash_async
 from fastapi import HTTPException
 from models import User
 from models.authorization import VerificationCode
@@ -56,7 +56,7 @@ async def create_public_user(db: AsyncSession, data: UserRegister) -> User:
             username=username,
             email=data.email,
             phone=normalized_phone,
-            hashed_password=get_password_hash(data.password),
+            hashed_password=await get_password_hash_async(data.password),
             role=UserRole.user,
         )
 
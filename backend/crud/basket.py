@@ -4,54 +4,100 @@ from fastapi import HTTPException
 from models.basket import Basket
 from models.menu import MenuItem
 from models.user import User
-from schemas.basket import BasketCreateSchema, BasketUpdateSchema
-from sqlalchemy import and_, delete, func, select
+from schemas.basket import BasketBulkSchema, BasketCreateSchema, BasketUpdateSchema
+from sqlalchemy import and_, delete, func, literal, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 logger = logging.getLogger(__name__)
 
 
+MAX_BASKET_QUANTITY = 99
+
+
+def _upsert_insert(db: AsyncSession):
+    if db.bind.dialect.name == "sqlite":
+        return sqlite.insert, func.min
+    return postgresql.insert, func.least
+
+
 async def create_basket(db: AsyncSession, data: BasketCreateSchema, user_id: int) -> Basket:
     try:
-        menu_item = await db.scalar(select(MenuItem).where(MenuItem.id == data.menu_item_id))
-        if not menu_item:
-            raise HTTPException(status_code=404, detail="Menu item not found")
-
-        existing_basket = await db.scalar(
-            select(Basket)
-            .options(selectinload(Basket.menu_item))
-            .where(and_(Basket.user_id == user_id, Basket.menu_item_id == data.menu_item_id))
+        insert, least = _upsert_insert(db)
+        # Selecting from menu_item folds the existence check into the insert: a missing item inserts nothing
+        stmt = insert(Basket).from_select(
+            ["user_id", "menu_item_id", "quantity"],
+            select(literal(user_id), MenuItem.id, literal(data.quantity)).where(MenuItem.id == data.menu_item_id),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Basket.user_id, Basket.menu_item_id],
+            set_={
+                "quantity": least(Basket.quantity + stmt.excluded.quantity, MAX_BASKET_QUANTITY),
+                "updated_at": func.now(),
+            },
+        )
+        # Two round-trips: the upsert, then a primary-key SELECT for menu_item. RETURNING cannot join, and the
+        # single-statement form (a data-modifying CTE joined to menu_item) is not available on SQLite.
+        basket = await db.scalar(
+            stmt.returning(Basket).options(selectinload(Basket.menu_item)),
+            execution_options={"populate_existing": True},
         )
+        if basket is None:
+            raise HTTPException(status_code=404, detail="Menu item not found")
 
-        if existing_basket:
-            existing_basket.quantity += data.quantity
-            await db.commit()
-            await db.refresh(existing_basket)
-            return existing_basket
+        await db.commit()
+        return basket
 
-        basket_data = data.dict(exclude_unset=True)
-        basket_data["user_id"] = user_id
-        basket = Basket(**basket_data)
+    except HTTPException:
+        await db.rollback()
+        raise
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"Error creating basket item: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
 
-        db.add(basket)
-        await db.commit()
-        await db.refresh(basket)
 
-        basket_with_menu = await db.scalar(
-            select(Basket).options(selectinload(Basket.menu_item)).where(Basket.id == basket.id)
-        )
+async def sync_basket(db: AsyncSession, data: BasketBulkSchema, user_id: int) -> dict:
+    try:
+        menu_item_ids = [item.menu_item_id for item in data.items]
+        if menu_item_ids:
+            found = set(await db.scalars(select(MenuItem.id).where(MenuItem.id.in_(menu_item_ids))))
+            missing = sorted(set(menu_item_ids) - found)
+            if missing:
+                raise HTTPException(status_code=404, detail=f"Menu items not found: {missing}")
+
+        await db.execute(delete(Basket).where(Basket.user_id == user_id, Basket.menu_item_id.not_in(menu_item_ids)))
+
+        if data.items:
+            insert, _ = _upsert_insert(db)
+            stmt = insert(Basket).values(
+                [
+                    {"user_id": user_id, "menu_item_id": item.menu_item_id, "quantity": item.quantity}
+                    for item in data.items
+                ]
+            )
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[Basket.user_id, Basket.menu_item_id],
+                    set_={"quantity": stmt.excluded.quantity, "updated_at": func.now()},
+                )
+            )
 
-        return basket_with_menu
+        await db.commit()
+        # The bulk statements bypass the identity map, so drop any rows this session already holds
+        db.expire_all()
 
     except HTTPException:
         await db.rollback()
         raise
     except Exception as e:
         await db.rollback()
-        logger.error(f"Error creating basket item: {e}", exc_info=True)
+        logger.error(f"Error syncing basket: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
+    return await get_baskets(db, user_id)
+
 
 async def get_basket(db: AsyncSession, basket_id: int) -> Basket:
     try:
@@ -82,13 +128,9 @@ async def get_baskets(db: AsyncSession, user_id: int, skip: int = 0, limit: int
         )
 
         baskets = result.scalars().all()
+        summary = await get_basket_summary(db, user_id)
 
-        total_count = 0
-        for basket in baskets:
-            if basket.menu_item and basket.menu_item.price:
-                total_count += basket.menu_item.price * basket.quantity
-
-        return {"baskets": baskets, "total_count": total_count}
+        return {"baskets": baskets, "total_count": summary["total_cost"]}
 
     except Exception as e:
         logger.error(f"Error getting user baskets: {e}", exc_info=True)
@@ -200,6 +242,28 @@ async def clear_user_basket(db: AsyncSession, user_id: int) -> None:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+async def get_basket_summary(db: AsyncSession, user_id: int) -> dict:
+    try:
+        # Served from the covering indexes on basket(user_id) and menu_item(id) without touching the heaps
+        row = (
+            await db.execute(
+                select(
+                    func.count(Basket.id),
+                    func.coalesce(func.sum(Basket.quantity), 0),
+                    func.coalesce(func.sum(func.coalesce(MenuItem.price, 0) * Basket.quantity), 0),
+                )
+                .join(MenuItem, MenuItem.id == Basket.menu_item_id)
+                .where(Basket.user_id == user_id)
+            )
+        ).one()
+
+        return {"item_count": row[0], "total_quantity": row[1], "total_cost": row[2]}
+
+    except Exception as e:
+        logger.error(f"Error getting basket summary: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
 async def get_basket_total_items(db: AsyncSession, user_id: int) -> int:
     try:
         result = await db.scalar(select(func.sum(Basket.quantity)).where(Basket.user_id == user_id))
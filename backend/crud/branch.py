@@ -3,6 +3,7 @@ import logging
 from fastapi import HTTPException
 from models import Branch
 from schemas.branch import BranchCreate
+from services.menu_cache import invalidate_branch_menus
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -66,6 +67,7 @@ async def delete_branch(branch_id: int, db: AsyncSession):
             branch.is_active = False
             await db.commit()
             await db.refresh(branch)
+            await invalidate_branch_menus(branch_id)
             return {"ok": True}
         else:
             return {"branch not found": False}
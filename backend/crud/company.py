@@ -1,10 +1,12 @@
 import logging
+from typing import Optional
 
 from fastapi import HTTPException
 from models import Company, User
 from schemas.company import CompanyCreate
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from utils.pagination import paginate
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +82,5 @@ async def delete_company(db: AsyncSession, company_id: int):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-async def get_companies(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(Company).where(Company.is_active == True).offset(skip).limit(limit))
-    return result.scalars().all()
+async def get_companies(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    return await paginate(db, select(Company).where(Company.is_active == True), Company, skip, limit, cursor)
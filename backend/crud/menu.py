@@ -1,15 +1,17 @@
 import logging
 from datetime import datetime
-from typing import List
+from typing import List, Optional, Tuple
 
 from fastapi import HTTPException, status
 from models.branch import Branch
-from models.menu import Menu
+from models.menu import Menu, MenuItem
 from schemas.menu import MenuCreate, MenuPatch, MenuUpdate
+from services.menu_cache import invalidate_branch_menus, invalidate_menu
 from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from utils.pagination import paginate
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +31,7 @@ async def create_menu(db: AsyncSession, data: MenuCreate) -> Menu:
         db.add(menu)
         await db.commit()
         await db.refresh(menu)
+        await invalidate_branch_menus(menu.branch_id)
 
         logger.info(f"Menu created successfully: {menu.id}")
         return menu
@@ -107,16 +110,44 @@ async def get_menu_by_branch(db: AsyncSession, branch_id: int) -> List[Menu]:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error retrieving menus")
 
 
-async def get_menus_paginated(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Menu]:
+async def get_branch_catalog(db: AsyncSession, branch_id: int) -> List[Menu]:
     try:
         query = (
-            select(Menu).options(selectinload(Menu.branch)).offset(skip).limit(limit).order_by(Menu.created_at.desc())
+            select(Menu)
+            .join(Branch, Branch.id == Menu.branch_id)
+            .options(selectinload(Menu.menu_item.and_(MenuItem.is_active == True, MenuItem.is_available == True)))
+            .where(Menu.branch_id == branch_id, Menu.is_active == True, Branch.is_active == True)
+            .order_by(Menu.created_at.desc(), Menu.id.desc())
+            .execution_options(populate_existing=True)
         )
         result = await db.execute(query)
-        menus = result.scalars().all()
+        menus = list(result.scalars().all())
 
-        return list(menus)
+        if not menus:
+            branch = await db.scalar(select(Branch.id).where(Branch.id == branch_id, Branch.is_active == True))
+            if branch is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail=f"Branch with ID {branch_id} not found"
+                )
+
+        return menus
 
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching catalog for branch {branch_id}: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error retrieving catalog")
+
+
+async def get_menus_paginated(
+    db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None
+) -> Tuple[List[Menu], Optional[str]]:
+    try:
+        query = select(Menu).options(selectinload(Menu.branch))
+        return await paginate(db, query, Menu, skip, limit, cursor)
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching paginated menus: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Error retrieving menus")
@@ -125,6 +156,7 @@ async def get_menus_paginated(db: AsyncSession, skip: int = 0, limit: int = 100)
 async def update_menu(db: AsyncSession, menu_id: int, data: MenuUpdate) -> Menu:
     try:
         menu = await get_menu(db, menu_id)
+        old_branch_id = menu.branch_id
 
         if data.branch_id and data.branch_id != menu.branch_id:
             branch_query = select(Branch).where(Branch.id == data.branch_id)
@@ -145,6 +177,7 @@ async def update_menu(db: AsyncSession, menu_id: int, data: MenuUpdate) -> Menu:
 
         updated_menu = result.scalar_one()
         await db.refresh(updated_menu)
+        await invalidate_menu(menu_id, old_branch_id, updated_menu.branch_id)
 
         logger.info(f"Menu {menu_id} updated successfully")
         return updated_menu
@@ -178,6 +211,7 @@ async def update_menu(db: AsyncSession, menu_id: int, data: MenuUpdate) -> Menu:
 async def patch_menu(db: AsyncSession, menu_id: int, data: MenuPatch) -> Menu:
     try:
         menu = await get_menu(db, menu_id)
+        old_branch_id = menu.branch_id
 
         update_data = data.dict(exclude_unset=True)
 
@@ -203,6 +237,7 @@ async def patch_menu(db: AsyncSession, menu_id: int, data: MenuPatch) -> Menu:
         await db.commit()
 
         await db.refresh(updated_menu)
+        await invalidate_menu(menu_id, old_branch_id, updated_menu.branch_id)
 
         logger.info(f"Menu {menu_id} patched successfully. Updated fields: {list(update_data.keys())}")
         return updated_menu
@@ -267,6 +302,7 @@ async def delete_menu(db: AsyncSession, menu_id: int):
             menu.is_active = False
             await db.commit()
             await db.refresh(menu)
+            await invalidate_menu(menu_id, menu.branch_id)
 
         return {"success": True}
 
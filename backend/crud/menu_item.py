@@ -4,6 +4,7 @@ from typing import Optional
 from fastapi import HTTPException, status
 from models.menu import Menu, MenuItem
 from schemas.menu_item import MenuItemCreate, MenuItemUpdate
+from services.menu_cache import invalidate_menu_item
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -47,6 +48,7 @@ async def create_menu_item(db: AsyncSession, data: MenuItemCreate, current_user_
         db.add(new_menu_item)
         await db.commit()
         await db.refresh(new_menu_item)
+        await invalidate_menu_item(new_menu_item.id, menu.branch_id)
 
         logger.info(f"Menu item created successfully: {new_menu_item.id} " f"by user {current_user_id}")
 
@@ -106,6 +108,7 @@ async def update_menu_item(
 ) -> MenuItem:
     try:
         menu_item = await get_menu_item(db, menu_item_id)
+        branch_id = menu_item.menu.branch_id
 
         if data.username and data.username != menu_item.username:
             existing_item_query = select(MenuItem).where(
@@ -131,6 +134,7 @@ async def update_menu_item(
 
         await db.commit()
         await db.refresh(menu_item)
+        await invalidate_menu_item(menu_item_id, branch_id)
 
         logger.info(f"Menu item updated successfully: {menu_item.id} " f"by user {current_user_id}")
 
@@ -167,9 +171,11 @@ async def delete_menu_item(db: AsyncSession, menu_item_id: int, current_user_id:
         menu_item = await get_menu_item(db, menu_item_id)
 
         if menu_item.is_active:
+            branch_id = menu_item.menu.branch_id
             menu_item.is_active = False
             await db.commit()
             await db.refresh(menu_item)
+            await invalidate_menu_item(menu_item_id, branch_id)
 
             logger.info(f"Menu item soft deleted successfully: {menu_item.id} " f"by user {current_user_id}")
 
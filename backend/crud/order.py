@@ -1,27 +1,44 @@
+import json
 import logging
 from datetime import datetime
 from typing import Optional
 
-from crud.basket import get_baskets
+from core.settings import settings
 from fastapi import HTTPException
+from models.basket import Basket
+from models.menu import MenuItem
 from models.order import Order, OrderItem, OrderStatus
 from schemas.order import OrderCreate, OrderUpdate
 from services.order import generate_order_id
-from sqlalchemy import func, select
+from sqlalchemy import Select, delete, func, insert, literal, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from utils.cache import TTLCache
+from utils.log import timeit
+from utils.pagination import paginate
 
 logger = logging.getLogger(__name__)
 
+_order_count_cache = TTLCache(maxsize=10_000, ttl=settings.ORDER_COUNT_CACHE_TTL_SECONDS)
 
+
+@timeit
 async def create_order(db: AsyncSession, payload: OrderCreate):
     try:
         logger.debug(f"Creating order with payload: {payload}")
 
-        user_baskets = await get_baskets(db, payload.user_id)
-        if not user_baskets["baskets"]:
+        # Lock the basket rows being checked out so a concurrent add can't slip between the copy and the delete
+        basket_ids = list(
+            await db.scalars(select(Basket.id).where(Basket.user_id == payload.user_id).with_for_update())
+        )
+        if not basket_ids:
             raise HTTPException(status_code=404, detail="No active baskets found for user")
 
+        price = func.coalesce(MenuItem.price, 0)
+        basket_lines = (
+            select(Basket).join(MenuItem, MenuItem.id == Basket.menu_item_id).where(Basket.id.in_(basket_ids))
+        )
+
         order_id = generate_order_id()
         order = Order(
             username=order_id,
@@ -30,23 +47,27 @@ async def create_order(db: AsyncSession, payload: OrderCreate):
             user_id=payload.user_id,
             branch_id=payload.branch_id,
             status=OrderStatus.PENDING,
-            total_amount=user_baskets["total_count"],
+            total_amount=basket_lines.with_only_columns(
+                func.coalesce(func.sum(price * Basket.quantity), 0)
+            ).scalar_subquery(),
         )
         db.add(order)
         await db.flush()
 
-        for basket in user_baskets["baskets"]:
-            order_item = OrderItem(
-                order_id=order.id,
-                menu_item_id=basket.menu_item_id,
-                quantity=basket.quantity,
-                price=basket.menu_item.price,
-                is_active=basket.is_active,
-                total_price=basket.menu_item.price * basket.quantity,
+        await db.execute(
+            insert(OrderItem).from_select(
+                ["order_id", "menu_item_id", "quantity", "price", "total_price", "is_active"],
+                basket_lines.with_only_columns(
+                    literal(order.id),
+                    Basket.menu_item_id,
+                    Basket.quantity,
+                    price,
+                    price * Basket.quantity,
+                    Basket.is_active,
+                ),
             )
-            db.add(order_item)
-        for basket in user_baskets["baskets"]:
-            await db.delete(basket)
+        )
+        await db.execute(delete(Basket).where(Basket.id.in_(basket_ids)))
 
         await db.commit()
         await db.refresh(order)
@@ -63,8 +84,48 @@ async def create_order(db: AsyncSession, payload: OrderCreate):
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+async def _estimate_count(db: AsyncSession, count_query: Select) -> Optional[int]:
+    if db.bind.dialect.name != "postgresql":
+        return None
+    # Explain the filtered row scan rather than the aggregate, whose top node always estimates one row.
+    # Filters are integers and booleans, so inlining them for EXPLAIN is safe.
+    rows_query = count_query.with_only_columns(Order.id)
+    compiled = rows_query.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = await db.scalar(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def _count_orders(db: AsyncSession, count_query: Select, cache_key: tuple, strategy: str) -> Optional[int]:
+    if strategy == "none":
+        return None
+
+    if strategy == "estimated":
+        estimate = await _estimate_count(db, count_query)
+        if estimate is not None:
+            return estimate
+
+    if strategy == "cached":
+        cached = _order_count_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    total_count = await db.scalar(count_query) or 0
+    if strategy == "cached":
+        _order_count_cache.set(cache_key, total_count)
+    return total_count
+
+
+@timeit
 async def get_orders(
-    db: AsyncSession, user_id: Optional[int] = None, branch_id: Optional[int] = None, skip: int = 0, limit: int = 100
+    db: AsyncSession,
+    user_id: Optional[int] = None,
+    branch_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    count_strategy: Optional[str] = None,
 ) -> dict:
     try:
         query = (
@@ -78,19 +139,28 @@ async def get_orders(
         if branch_id:
             query = query.where(Order.branch_id == branch_id)
 
-        query = query.order_by(Order.created_at.desc()).offset(skip).limit(limit)
-
-        count_query = select(func.count(Order.id))
+        count_query = select(func.count(Order.id)).where(Order.is_active == True)
         if user_id:
             count_query = count_query.where(Order.user_id == user_id)
         if branch_id:
             count_query = count_query.where(Order.branch_id == branch_id)
 
-        orders = await db.scalars(query)
-        total_count = await db.scalar(count_query)
+        orders, next_cursor = await paginate(db, query, Order, skip, limit, cursor)
+        total_count = await _count_orders(
+            db, count_query, (user_id, branch_id), count_strategy or settings.ORDER_COUNT_STRATEGY
+        )
 
-        return {"orders": orders.all(), "total_count": total_count or 0, "skip": skip, "limit": limit}
+        return {
+            "orders": orders,
+            "total_count": total_count,
+            "has_more": next_cursor is not None,
+            "skip": skip,
+            "limit": limit,
+            "next_cursor": next_cursor,
+        }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting orders: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
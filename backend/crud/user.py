@@ -1,14 +1,16 @@
 import logging
 import re
+from typing import Optional
 from uuid import uuid4
 
-from core.security import get_password_hash
+from core.security import get_password_hash_async, invalidate_principal, revoke_tokens
 from fastapi import HTTPException
 from models import User
 from models.user import UserRole
 from schemas.user import UserCreate, UserUpdate
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from utils.pagination import paginate
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +33,10 @@ async def create_user(db: AsyncSession, data: UserCreate) -> User:
             username = f"{username}_{uuid4().hex[:4]}"
 
         user = User(
-            username=username, email=data.email, hashed_password=get_password_hash(data.password), role=data.role
+            username=username,
+            email=data.email,
+            hashed_password=await get_password_hash_async(data.password),
+            role=data.role,
         )
 
         db.add(user)
@@ -47,9 +52,8 @@ async def create_user(db: AsyncSession, data: UserCreate) -> User:
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(select(User).where(User.is_active == True).offset(skip).limit(limit))
-    return result.scalars().all()
+async def get_users(db: AsyncSession, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    return await paginate(db, select(User).where(User.is_active == True), User, skip, limit, cursor)
 
 
 # Read one
@@ -82,6 +86,7 @@ async def update_user(db: AsyncSession, user_id: int, user_update: UserUpdate):
                 setattr(user, key, value)
 
         await db.commit()
+        invalidate_principal(user_id)
         await db.refresh(user)
         return user
 
@@ -100,7 +105,9 @@ async def delete_user(db: AsyncSession, user_id: int):
 
     if user.is_active:
         user.is_active = False
+        user.token_version += 1
         await db.commit()
+        await revoke_tokens(user_id, user.token_version)
         await db.refresh(user)
 
     return {"success": True, "message": "User deactivated"}
@@ -116,6 +123,8 @@ async def update_user_role(db: AsyncSession, user_id: int, new_role: UserRole) -
         return user
 
     user.role = new_role
+    user.token_version += 1
     await db.commit()
+    await revoke_tokens(user_id, user.token_version)
     await db.refresh(user)
     return user
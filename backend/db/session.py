@@ -1,7 +1,155 @@
+import hashlib
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
 from core.settings import settings
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy import event, exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_time_total += waited
+            if waited > self.wait_time_max:
+                self.wait_time_max = waited
+
+
+class QueryStats:
+    __slots__ = ("count", "total_ms", "slowest_ms", "slowest_statement")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+
+# Set per request by QueryStatsMiddleware; the engine hooks below add to whatever is current
+query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def instrument_engine(db_engine: AsyncEngine) -> None:
+    sync_engine = db_engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info["query_started_at"].pop()) * 1000
+        stats = query_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed_ms)
+        if settings.DB_SLOW_QUERY_MS and elapsed_ms >= settings.DB_SLOW_QUERY_MS:
+            logger.warning(
+                f"Slow query ({elapsed_ms:.1f} ms): {statement} parameters={parameters!r}",
+                extra={"db_elapsed_ms": round(elapsed_ms, 3), "db_statement": statement},
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(context):
+        started = context.connection.info.get("query_started_at") if context.connection is not None else None
+        if started:
+            started.pop()
+
+
+def create_engine_from_settings(url: str) -> AsyncEngine:
+    kwargs = {"echo": settings.DB_ECHO, "pool_pre_ping": settings.DB_POOL_PRE_PING, "future": True}
+
+    if settings.DB_POOL_CLASS == "null":
+        kwargs["poolclass"] = NullPool
+    else:
+        kwargs.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+
+    behind_pgbouncer = settings.DB_POOL_CLASS == "null"
+    is_postgres = url.startswith("postgresql+asyncpg://")
+    if is_postgres:
+        connect_args = {}
+        if settings.DB_STATEMENT_TIMEOUT_MS and not behind_pgbouncer:
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        if behind_pgbouncer:
+            # pgbouncer in transaction mode cannot keep prepared statements across transactions
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+        kwargs["connect_args"] = connect_args
+
+    db_engine = create_async_engine(url, **kwargs)
+    instrument_engine(db_engine)
+
+    if is_postgres and behind_pgbouncer and settings.DB_STATEMENT_TIMEOUT_MS:
+        # pgbouncer rejects unknown startup parameters, so the timeout is set per transaction instead
+        timeout_sql = f"SET LOCAL statement_timeout = {int(settings.DB_STATEMENT_TIMEOUT_MS)}"
 
-engine = create_async_engine(settings.database_url, echo=True, pool_pre_ping=True, future=True)
+        @event.listens_for(db_engine.sync_engine, "begin")
+        def _set_statement_timeout(conn):
+            conn.exec_driver_sql(timeout_sql)
+
+    return db_engine
+
+
+def pool_status(db_engine: AsyncEngine) -> dict:
+    pool = db_engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"pool_class": type(pool).__name__}
+
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checkouts": pool.checkouts,
+        "timeouts": pool.timeouts,
+        "wait_time_total_ms": round(pool.wait_time_total * 1000, 3),
+        "wait_time_avg_ms": round(pool.wait_time_total * 1000 / pool.checkouts, 3) if pool.checkouts else 0.0,
+        "wait_time_max_ms": round(pool.wait_time_max * 1000, 3),
+    }
+
+
+engine = create_engine_from_settings(settings.database_url)
 
 async_session = async_sessionmaker(
     bind=engine,
@@ -11,6 +159,70 @@ async_session = async_sessionmaker(
 )
 
 
+read_engine = (
+    create_engine_from_settings(settings.READ_REPLICA_DATABASE_URL) if settings.READ_REPLICA_DATABASE_URL else None
+)
+
+async_read_session = (
+    async_sessionmaker(bind=read_engine, expire_on_commit=False, autoflush=False, autocommit=False)
+    if read_engine is not None
+    else None
+)
+
+replica_state = {"checked_at": 0.0, "usable": False, "lag_seconds": None}
+_recent_writers = TTLCache(maxsize=settings.DB_READ_YOUR_WRITES_MAX_CLIENTS, ttl=settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+def mark_recent_write(client_key: str) -> None:
+    _recent_writers.set(client_key, True)
+
+
+def wrote_recently(client_key: str | None) -> bool:
+    if not client_key:
+        return False
+    return _recent_writers.get(client_key, False)
+
+
+async def replica_usable() -> bool:
+    now = time.monotonic()
+    if now - replica_state["checked_at"] < settings.DB_REPLICA_CHECK_INTERVAL_SECONDS:
+        return replica_state["usable"]
+
+    # Claim the check before awaiting so concurrent requests keep using the last known state
+    replica_state["checked_at"] = now
+    try:
+        async with async_read_session() as session:
+            lag = float(await session.scalar(REPLICA_LAG_QUERY) or 0)
+        replica_state["lag_seconds"] = lag
+        replica_state["usable"] = lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+        if not replica_state["usable"]:
+            logger.warning(f"Read replica lagging {lag:.1f}s, routing reads to primary")
+    except Exception as e:
+        replica_state["lag_seconds"] = None
+        replica_state["usable"] = False
+        logger.warning(f"Read replica check failed, routing reads to primary: {e}")
+    return replica_state["usable"]
+
+
+def client_key_from_headers(headers) -> str | None:
+    # Hash the bearer token so raw credentials are never kept in memory as dict keys
+    authorization = headers.get("authorization")
+    if not authorization:
+        return None
+    return hashlib.blake2b(authorization.encode(), digest_size=16).hexdigest()
+
+
 async def get_pg_db():
     async with async_session() as session:
         yield session
+
+
+async def get_read_db(request: Request):
+    use_replica = (
+        async_read_session is not None
+        and not wrote_recently(client_key_from_headers(request.headers))
+        and await replica_usable()
+    )
+    session_factory = async_read_session if use_replica else async_session
+    async with session_factory() as session:
+        yield session
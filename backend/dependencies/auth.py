@@ -1,7 +1,7 @@
 import logging
 from typing import Optional
 
-from core.security import decode_access_token
+from core.security import decode_access_token, is_token_revoked, principal_cache
 from db.session import get_pg_db
 from dependencies.permission import ASSIGN_RULES
 from fastapi import Depends, HTTPException, Security, status
@@ -9,6 +9,7 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 from models import User
 from models.user import UserRole
+from schemas.token import Principal
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -17,57 +18,98 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 logger = logging.getLogger(__name__)
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_pg_db)) -> User:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def _decode_claims(token: str) -> tuple[int, dict]:
     try:
         payload = decode_access_token(token)
         sub = payload.get("sub")
         if sub is None:
             logger.warning("Token without 'sub' claim")
-            raise credentials_exception
-        user_id = int(sub)
+            raise _credentials_exception()
+        return int(sub), payload
     except (JWTError, ValueError) as e:
         logger.warning(f"Token validation failed: {type(e).__name__}")
-        raise credentials_exception
+        raise _credentials_exception()
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user: User | None = result.scalar_one_or_none()
 
-    if user is None:
+async def _load_principal(db: AsyncSession, user_id: int) -> Principal:
+    result = await db.execute(select(User.id, User.role, User.is_active, User.token_version).where(User.id == user_id))
+    row = result.one_or_none()
+
+    if row is None:
         logger.warning(f"User not found: {user_id}")
-        raise credentials_exception
+        raise _credentials_exception()
+
+    principal = Principal(id=row.id, role=row.role, is_active=row.is_active, token_version=row.token_version)
+    principal_cache.set(user_id, principal)
+    return principal
 
-    if not user.is_active:
+
+def _check_principal(principal: Principal, user_id: int, payload: dict) -> Principal:
+    if not principal.is_active:
         logger.warning(f"Inactive user attempted access: {user_id}")
-        raise credentials_exception
+        raise _credentials_exception()
+
+    if int(payload.get("ver", 0)) != principal.token_version:
+        logger.warning(f"Stale token version for user: {user_id}")
+        raise _credentials_exception()
+
+    role = payload.get("role")
+    if role is not None and role != principal.role.value:
+        logger.warning(f"Token role no longer matches user: {user_id}")
+        raise _credentials_exception()
 
+    return principal
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_pg_db)) -> Principal:
+    user_id, payload = _decode_claims(token)
+    if await is_token_revoked(user_id, int(payload.get("ver", 0))):
+        logger.warning(f"Revoked token used for user: {user_id}")
+        raise _credentials_exception()
+
+    principal: Principal | None = principal_cache.get(user_id)
+    if principal is None:
+        principal = await _load_principal(db, user_id)
+
+    return _check_principal(principal, user_id, payload)
+
+
+async def get_current_db_user(
+    principal: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_pg_db)
+) -> User:
+    user = await db.scalar(select(User).where(User.id == principal.id, User.is_active == True))
+    if user is None:
+        raise _credentials_exception()
     return user
 
 
-async def require_admin(current_user: User = Depends(get_current_user)):
+async def require_admin(current_user: Principal = Depends(get_current_user)):
     if current_user.role != UserRole.admin:
         raise HTTPException(status_code=403, detail="Admin access required")
     return current_user
 
 
-async def require_admin_or_company(current_user: User = Depends(get_current_user)):
+async def require_admin_or_company(current_user: Principal = Depends(get_current_user)):
     if current_user.role not in [UserRole.admin, UserRole.company]:
         raise HTTPException(status_code=403, detail="Admin or Company access required")
     return current_user
 
 
-async def require_company_or_branch(current_user: User = Depends(get_current_user)):
+async def require_company_or_branch(current_user: Principal = Depends(get_current_user)):
     if current_user.role not in [UserRole.company, UserRole.branch]:
         raise HTTPException(status_code=403, detail="Company or Branch access required")
     return current_user
 
 
-async def require_branch(current_user: User = Depends(get_current_user)):
+async def require_branch(current_user: Principal = Depends(get_current_user)):
     if current_user.role != UserRole.branch:
         raise HTTPException(status_code=403, detail="Branch access required")
     return current_user
@@ -75,7 +117,7 @@ async def require_branch(current_user: User = Depends(get_current_user)):
 
 def check_assign_permission(
     target_role: UserRole,
-    current: Optional[User] = Security(get_current_user, scopes=[]),
+    current: Optional[Principal] = Security(get_current_user, scopes=[]),
 ):
     if current is None:
         raise HTTPException(status_code=401, detail="Authentication required")
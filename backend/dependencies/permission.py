@@ -1,6 +1,6 @@
 from fastapi import HTTPException, status
-from models import User
 from models.user import UserRole
+from schemas.token import Principal
 
 ASSIGN_RULES: dict[UserRole, set[UserRole]] = {
     UserRole.admin: set(UserRole),
@@ -11,7 +11,7 @@ ASSIGN_RULES: dict[UserRole, set[UserRole]] = {
 
 def check_assign_permission(
     new_role: UserRole,
-    current: User,
+    current: Principal,
 ) -> None:
     allowed = ASSIGN_RULES.get(current.role, set())
     if new_role not in allowed:
@@ -0,0 +1,66 @@
+import os
+import sys
+
+from server import worker_count
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = worker_count()
+worker_class = "server.TunedUvicornWorker"
+preload_app = os.getenv("PRELOAD_APP", "true").lower() == "true"
+
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+# Jitter spreads recycles out so workers are not replaced at the same moment
+max_requests = int(os.getenv("MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "200"))
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    from services.order import validate_worker_nodes
+
+    validate_worker_nodes(server.cfg.workers)
+
+    from core.settings import settings
+
+    if server.cfg.workers > 1 and not settings.CACHE_REDIS_URL:
+        server.log.warning(
+            "CACHE_REDIS_URL is not set: each worker keeps its own menu cache and token revocations, so an "
+            f"invalidation on one worker leaves the others stale for up to {settings.MENU_CACHE_TTL_SECONDS:g}s"
+        )
+
+
+def pre_fork(server, worker):
+    # Runs in the master, which knows every live worker; the slot is copied into the child by fork
+    from services.order import claim_worker_slot
+
+    worker.order_id_slot = claim_worker_slot({w.order_id_slot for w in server.WORKERS.values()})
+
+
+def post_fork(server, worker):
+    from services.order import reset_order_id_generator, worker_node_id
+
+    node_id = worker_node_id(worker.order_id_slot)
+    reset_order_id_generator(node_id)
+    server.log.info(f"Worker {worker.pid} uses order id node {node_id} (slot {worker.order_id_slot})")
+    if not server.cfg.preload_app:
+        return
+    # The master imported the app; drop any pooled connections inherited from it without closing
+    # the parent's sockets
+    from db.session import engine, read_engine
+
+    engine.sync_engine.dispose(close=False)
+    if read_engine is not None:
+        read_engine.sync_engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    # Each worker gets its own jittered limit; /readyz starts failing just before it is reached
+    if worker.max_requests < sys.maxsize:
+        from services.health import health_monitor
+
+        health_monitor.max_requests = worker.max_requests
@@ -2,12 +2,24 @@ import logging
 from contextlib import asynccontextmanager
 
 from api import router as api_router
+from core.middleware import (
+    CompressionMiddleware,
+    DrainingMiddleware,
+    MetricsMiddleware,
+    ProfilingMiddleware,
+    QueryStatsMiddleware,
+    ReadYourWritesMiddleware,
+)
+from core.security import hash_stats, principal_cache
 from core.settings import settings
-from db.session import get_pg_db
-from fastapi import Depends, FastAPI, HTTPException
+from db.session import engine, pool_status, read_engine, replica_state
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
+from services.health import health_monitor
+from services.menu_cache import menu_cache
+from services.metrics import render_prometheus
+from utils.log import timings
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,9 +29,16 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Application starting up...")
+    health_monitor.start()
     yield
     # Shutdown
     logger.info("Application shutting down...")
+    health_monitor.start_draining("shutdown")
+    await health_monitor.stop()
+    # Close pooled connections so a recycled worker exits instead of waiting on them
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
 
 
 app = FastAPI(
@@ -27,6 +46,7 @@ app = FastAPI(
     description="Coffee Shop Management API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.DEBUG else None,
 )
 
@@ -37,27 +57,67 @@ app.add_middleware(
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE"],
     allow_headers=["*"],
 )
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE, level=settings.COMPRESSION_LEVEL
+    )
+if settings.READ_REPLICA_DATABASE_URL:
+    app.add_middleware(ReadYourWritesMiddleware)
+if settings.DB_QUERY_STATS:
+    app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(DrainingMiddleware)
 
 app.include_router(api_router)
 
 
 @app.get("/ping")
-async def ping(db: AsyncSession = Depends(get_pg_db)):
-    await db.execute(text("SELECT 1"))
+async def ping():
     return {"message": "pong"}
 
 
+@app.get("/livez", include_in_schema=False, tags=["Health"])
+async def livez():
+    return {"status": "alive"}
+
+
+# Probes read the state kept fresh by health_monitor instead of querying the database themselves
+@app.get("/readyz", include_in_schema=False, tags=["Health"])
+async def readyz():
+    return JSONResponse(health_monitor.status(), status_code=200 if health_monitor.ready else 503)
+
+
 @app.get("/health", include_in_schema=False, tags=["Health"])
-async def health_check(db: AsyncSession = Depends(get_pg_db)):
-    try:
-        result = await db.execute(text("SELECT version()"))
-        db_version = result.scalar()
-        return {
-            "status": "healthy",
-            "database": "connected",
-            "version": app.version,
-            "environment": "production" if not settings.DEBUG else "development",
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        raise HTTPException(503, {"detail": "Service unavailable", "database": "disconnected"})
+async def health_check():
+    data = {
+        **health_monitor.status(),
+        "version": app.version,
+        "environment": "production" if not settings.DEBUG else "development",
+    }
+    return JSONResponse(data, status_code=200 if health_monitor.ready else 503)
+
+
+def _metrics_snapshot() -> dict:
+    data = {
+        "db_pool": pool_status(engine),
+        "principal_cache": principal_cache.stats(),
+        "password_hashing": hash_stats,
+        "menu_cache": menu_cache.stats(),
+        "health": {"ready": health_monitor.ready, "requests_served": health_monitor.requests_served},
+        "timings": timings.snapshot(),
+    }
+    if read_engine is not None:
+        data["db_read_pool"] = pool_status(read_engine)
+        data["replica"] = {"usable": replica_state["usable"], "lag_seconds": replica_state["lag_seconds"]}
+    return data
+
+
+# One endpoint, two views of the same snapshot: the JSON dict for humans and existing dashboards,
+# Prometheus text (request histograms plus the snapshot flattened into app_* gauges) for scrapers
+@app.get("/metrics", include_in_schema=False, tags=["Health"])
+async def metrics(request: Request, format: str | None = None):
+    accept = request.headers.get("accept", "")
+    if format == "prometheus" or (format is None and ("text/plain" in accept or "openmetrics" in accept)):
+        return PlainTextResponse(render_prometheus(_metrics_snapshot()), media_type="text/plain; version=0.0.4")
+    return _metrics_snapshot()
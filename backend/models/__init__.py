@@ -3,6 +3,7 @@ from models.base import BaseModel
 from models.basket import Basket
 from models.branch import Branch
 from models.company import Company
+from models.idempotency import IdempotencyKey
 from models.menu import Menu
 from models.order import Order
 from models.user import User
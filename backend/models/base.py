@@ -1,10 +1,13 @@
 from datetime import datetime
 
 from db.base import Base
-from sqlalchemy import Boolean, DateTime, Integer
+from sqlalchemy import Boolean, DateTime, Integer, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
+# Partial-index predicate for soft-deleted tables; queries filter with `is_active == True`
+ACTIVE_ONLY = {"postgresql_where": text("is_active"), "sqlite_where": text("is_active = 1")}
+
 
 class BaseModel(Base):
     __abstract__ = True
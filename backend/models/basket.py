@@ -1,5 +1,5 @@
 from models import BaseModel
-from sqlalchemy import CheckConstraint, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import CheckConstraint, ForeignKey, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -20,6 +20,8 @@ class Basket(BaseModel):
         UniqueConstraint("user_id", "menu_item_id", name="uq_user_menu_item"),
         CheckConstraint("quantity > 0", name="ck_quantity_positive"),
         CheckConstraint("quantity <= 99", name="ck_quantity_reasonable"),
+        # Covering index for the basket summary aggregate
+        Index("ix_basket_user_id_summary", "user_id", postgresql_include=["menu_item_id", "quantity"]),
     )
 
     def __repr__(self) -> str:
@@ -1,7 +1,8 @@
 from typing import List
 
 from models import BaseModel
-from sqlalchemy import ForeignKey, Integer, String
+from models.base import ACTIVE_ONLY
+from sqlalchemy import ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -18,3 +19,5 @@ class Company(BaseModel):
     branch: Mapped[List["Branch"]] = relationship("Branch", back_populates="company")
 
     owner: Mapped["User"] = relationship("User", back_populates="company", uselist=False)
+
+    __table_args__ = (Index("ix_company_created_at_id", "created_at", "id", **ACTIVE_ONLY),)
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Optional
+
+from models.base import BaseModel
+from sqlalchemy import DateTime, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class IdempotencyKey(BaseModel):
+    __tablename__ = "idempotency_key"
+
+    key: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    response_body: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    # Claim lease: an unfinished key whose lease ran out can be taken over by a retry
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
@@ -1,7 +1,8 @@
 from typing import List
 
 from models import BaseModel
-from sqlalchemy import Boolean, ForeignKey, Integer, String, Text
+from models.base import ACTIVE_ONLY
+from sqlalchemy import Boolean, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -16,6 +17,11 @@ class Menu(BaseModel):
     branch: Mapped["Branch"] = relationship("Branch", back_populates="menu", uselist=False)
     menu_item: Mapped[List["MenuItem"]] = relationship("MenuItem", back_populates="menu", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_menu_created_at_id", "created_at", "id"),
+        Index("ix_menu_branch_id_created_at_id", "branch_id", "created_at", "id"),
+    )
+
 
 class MenuItem(BaseModel):
     __tablename__ = "menu_item"
@@ -32,3 +38,8 @@ class MenuItem(BaseModel):
     order_item: Mapped["OrderItem"] = relationship(
         "OrderItem", back_populates="menu_item", cascade="all, delete-orphan"
     )
+
+    __table_args__ = (
+        Index("ix_menu_item_id_price", "id", postgresql_include=["price"]),
+        Index("ix_menu_item_menu_id_active", "menu_id", **ACTIVE_ONLY),
+    )
@@ -1,8 +1,9 @@
 import enum
 
 from models import BaseModel
+from models.base import ACTIVE_ONLY
 from sqlalchemy import Enum as SAEnum
-from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy import ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
@@ -37,6 +38,12 @@ class Order(BaseModel):
     user: Mapped["User"] = relationship("User", back_populates="order")
     order_item: Mapped["OrderItem"] = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("ix_order_created_at_id", "created_at", "id", **ACTIVE_ONLY),
+        Index("ix_order_user_id_created_at_id", "user_id", "created_at", "id", **ACTIVE_ONLY),
+        Index("ix_order_branch_id_created_at_id", "branch_id", "created_at", "id", **ACTIVE_ONLY),
+    )
+
     # def __repr__(self):
     #     return f"<Order(id={self.id}, user_id={self.user_id}, status={self.status.value})>"
 
@@ -2,7 +2,8 @@ import enum
 from typing import List
 
 from models import BaseModel
-from sqlalchemy import Boolean, String
+from models.base import ACTIVE_ONLY
+from sqlalchemy import Boolean, Index, Integer, String
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -23,8 +24,11 @@ class User(BaseModel):
     phone: Mapped[str] = mapped_column(String(255), nullable=True)
     is_verified: Mapped[bool] = mapped_column(Boolean, default=False)
     role: Mapped[UserRole] = mapped_column(SAEnum(UserRole, name="user_role", create_type=True), nullable=False)
+    token_version: Mapped[int] = mapped_column(Integer, default=0, server_default="0", nullable=False)
 
     branch: Mapped[List["Branch"]] = relationship("Branch", back_populates="owner", uselist=False)
     company: Mapped["Company"] = relationship("Company", back_populates="owner", uselist=False)
     order: Mapped[List["Order"]] = relationship("Order", back_populates="user")
     basket: Mapped["Basket"] = relationship("Basket", back_populates="user", cascade="all, delete-orphan")
+
+    __table_args__ = (Index("ix_user_created_at_id", "created_at", "id", **ACTIVE_ONLY),)
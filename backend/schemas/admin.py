@@ -0,0 +1,43 @@
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+
+class ProfilingStart(BaseModel):
+    sample_rate: float = Field(0.1, gt=0, le=1)
+    path_prefix: str = Field("/api/v1/orders", min_length=1)
+    max_requests: int = Field(10, ge=1, le=100)
+
+
+class ProfilingStatus(BaseModel):
+    enabled: bool
+    sample_rate: float
+    path_prefix: str
+    remaining: int
+    collected: int
+
+
+class RequestProfile(BaseModel):
+    method: str
+    path: str
+    duration_ms: float
+    captured_at: str
+    stats: str
+
+
+class FunctionTiming(BaseModel):
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class TimingsResponse(BaseModel):
+    functions: Dict[str, FunctionTiming]
+
+
+class ProfilesResponse(BaseModel):
+    status: ProfilingStatus
+    profiles: List[RequestProfile]
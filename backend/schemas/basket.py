@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class MenuItemResponse(BaseModel):
@@ -23,6 +23,17 @@ class BasketCreateSchema(BaseModel):
     quantity: int = Field(default=1, gt=0, le=99, description="Quantity of items")
 
 
+class BasketBulkSchema(BaseModel):
+    items: List[BasketCreateSchema] = Field(..., max_length=100, description="Desired basket contents")
+
+    @field_validator("items")
+    @classmethod
+    def unique_menu_items(cls, v: List[BasketCreateSchema]) -> List[BasketCreateSchema]:
+        if len({item.menu_item_id for item in v}) != len(v):
+            raise ValueError("Each menu item may appear only once")
+        return v
+
+
 class BasketUpdateSchema(BaseModel):
     menu_item_id: int = Field(..., gt=0, description="Menu item ID")
     quantity: int = Field(..., gt=0, le=99, description="Quantity of items")
@@ -40,6 +51,12 @@ class BasketResponse(BaseModel):
     menu_item: MenuItemResponse = None
 
 
+class BasketSummaryResponse(BaseModel):
+    item_count: int = Field(description="Distinct menu items in basket")
+    total_quantity: int
+    total_cost: int
+
+
 class BasketListResponse(BaseModel):
     baskets: List[BasketResponse]
     total_count: int = Field(description="Total cost of all items in basket")
@@ -1,6 +1,8 @@
 from datetime import datetime
+from typing import List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from schemas.menu_item import MenuItemResponse
 
 
 class MenuCreate(BaseModel):
@@ -34,6 +36,10 @@ class MenuResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class MenuCatalogResponse(MenuResponse):
+    items: List[MenuItemResponse] = Field(default_factory=list, validation_alias="menu_item")
+
+
 class MenuUpdate(BaseModel):
     username: str | None = None
     logo: str | None = None
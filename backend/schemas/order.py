@@ -48,6 +48,8 @@ class OrderUpdate(BaseModel):
 
 class OrdersResponse(BaseModel):
     orders: list[OrderResponse]
-    total_count: int
+    total_count: int | None = None
+    has_more: bool = False
     skip: int
     limit: int
+    next_cursor: str | None = None
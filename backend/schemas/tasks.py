@@ -8,6 +8,7 @@ from pydantic import BaseModel, field_validator
 class CleanupType(str, Enum):
     UNVERIFIED_USERS = "unverified_users"
     EXPIRED_CODES = "expired_codes"
+    IDEMPOTENCY_KEYS = "idempotency_keys"
     ALL = "all"
 
 
@@ -33,6 +34,7 @@ class CleanupResponse(BaseModel):
     dry_run: bool
     deleted_users: int = 0
     deleted_codes: int = 0
+    deleted_idempotency_keys: int = 0
     processed_users: List[dict] = []
     execution_time: float
     message: str
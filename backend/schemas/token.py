@@ -1,5 +1,6 @@
 from typing import Optional
 
+from models.user import UserRole
 from pydantic import BaseModel
 
 
@@ -11,3 +12,12 @@ class Token(BaseModel):
 class TokenData(BaseModel):
     user_id: Optional[int] = None
     role: Optional[str] = None
+
+
+class Principal(BaseModel):
+    id: int
+    role: UserRole
+    is_active: bool = True
+    token_version: int = 0
+
+    model_config = {"frozen": True, "from_attributes": True}
@@ -0,0 +1,48 @@
+import math
+import os
+
+from uvicorn.workers import UvicornWorker
+
+
+class TunedUvicornWorker(UvicornWorker):
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+
+def _read(path: str) -> str | None:
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit() -> float | None:
+    # cgroup v2: "<quota> <period>" or "max <period>"
+    cpu_max = _read("/sys/fs/cgroup/cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+
+    # cgroup v1
+    quota = _read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+    period = _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def available_cpus() -> float:
+    host_cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    return min(limit, host_cpus) if limit else host_cpus
+
+
+def worker_count() -> int:
+    if os.getenv("WEB_CONCURRENCY"):
+        return max(1, int(os.environ["WEB_CONCURRENCY"]))
+    # Async workers are each CPU-bound at saturation, so one per CPU; never fewer than two so a
+    # max-requests recycle always leaves a worker serving
+    workers = max(2, math.ceil(available_cpus()))
+    return min(workers, int(os.getenv("WEB_MAX_WORKERS", "8")))
@@ -1,7 +1,9 @@
 import logging
 from datetime import datetime, timedelta, timezone
 
+from core.security import revoke_tokens
 from models.authorization import VerificationCode
+from models.idempotency import IdempotencyKey
 from models.user import User
 from schemas.tasks import CleanupRequest
 from sqlalchemy import and_, delete, func, or_, select
@@ -48,12 +50,15 @@ async def _cleanup_unverified_users_api(db: AsyncSession, payload: CleanupReques
                 await db.execute(codes_stmt)
 
                 user.is_active = False
+                user.token_version += 1
                 user.updated_at = datetime.now(timezone.utc)
 
                 deleted_count += 1
 
         if not payload.dry_run:
             await db.commit()
+            for user in users_to_delete:
+                await revoke_tokens(user.id, user.token_version)
 
         return {"deleted_users": deleted_count, "deleted_codes": 0, "processed_users": processed_users}
 
@@ -87,3 +92,30 @@ async def _cleanup_expired_codes_api(db: AsyncSession, payload: CleanupRequest)
             await db.rollback()
         logger.error(f"Error during codes cleanup: {e}", exc_info=True)
         raise
+
+
+async def _cleanup_expired_idempotency_keys_api(db: AsyncSession, payload: CleanupRequest) -> dict:
+    deleted_count = 0
+
+    try:
+        now = datetime.now(timezone.utc)
+        if not payload.dry_run:
+            result = await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < now))
+            deleted_count = result.rowcount
+            await db.commit()
+        else:
+            result = await db.execute(select(func.count(IdempotencyKey.id)).where(IdempotencyKey.expires_at < now))
+            deleted_count = result.scalar()
+
+        return {
+            "deleted_users": 0,
+            "deleted_codes": 0,
+            "deleted_idempotency_keys": deleted_count,
+            "processed_users": [],
+        }
+
+    except Exception as e:
+        if not payload.dry_run:
+            await db.rollback()
+        logger.error(f"Error during idempotency keys cleanup: {e}", exc_info=True)
+        raise
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from core.settings import settings
+from db.session import engine
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    def __init__(self, db_engine: AsyncEngine):
+        self.engine = db_engine
+        self.database_ok: Optional[bool] = None
+        self.checked_at: Optional[float] = None
+        self.latency_ms: Optional[float] = None
+        self.error: Optional[str] = None
+        self.draining = False
+        self.drain_reason: Optional[str] = None
+        self.max_requests: Optional[int] = settings.WORKER_MAX_REQUESTS
+        self.requests_served = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def check(self) -> bool:
+        started = time.perf_counter()
+        try:
+            # Covers the pool checkout and connect too, not just the query
+            async with asyncio.timeout(settings.HEALTH_CHECK_TIMEOUT_SECONDS):
+                async with self.engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            if self.database_ok is False:
+                logger.info("Database reachable again, worker is ready")
+            self.database_ok, self.error = True, None
+        except Exception as e:
+            if self.database_ok is not False:
+                logger.error(f"Database health check failed: {e}")
+            self.database_ok, self.error = False, type(e).__name__
+        self.latency_ms = round((time.perf_counter() - started) * 1000, 3)
+        self.checked_at = time.time()
+        return self.database_ok
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.HEALTH_CHECK_INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def start_draining(self, reason: str) -> None:
+        if not self.draining:
+            logger.info(f"Worker draining: {reason}")
+        self.draining, self.drain_reason = True, reason
+
+    @property
+    def drain_after(self) -> Optional[int]:
+        if not self.max_requests:
+            return None
+        # A margin as large as the limit would leave the worker draining from its first request
+        return self.max_requests - min(settings.HEALTH_DRAIN_MARGIN_REQUESTS, self.max_requests // 2)
+
+    # Draining is per worker: behind gunicorn's shared socket only the probes this worker answers fail, so
+    # readiness dips briefly around a recycle instead of taking the whole instance out of rotation.
+    def note_request(self) -> None:
+        self.requests_served += 1
+        # Stop advertising readiness shortly before gunicorn recycles this worker at --max-requests
+        drain_after = self.drain_after
+        if drain_after is not None and self.requests_served >= drain_after:
+            self.start_draining("max requests reached")
+
+    @property
+    def ready(self) -> bool:
+        return bool(self.database_ok) and not self.draining
+
+    def status(self) -> dict:
+        if self.draining:
+            state = "draining"
+        elif self.database_ok is None:
+            state = "starting"
+        else:
+            state = "ready" if self.database_ok else "unavailable"
+        return {
+            "status": state,
+            "database": {
+                "ok": self.database_ok,
+                "checked_at": self.checked_at,
+                "latency_ms": self.latency_ms,
+                "error": self.error,
+            },
+            "draining": self.draining,
+            "drain_reason": self.drain_reason,
+            "requests_served": self.requests_served,
+        }
+
+
+health_monitor = HealthMonitor(engine)
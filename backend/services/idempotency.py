@@ -0,0 +1,216 @@
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+
+from core.settings import settings
+from fastapi import HTTPException, Request, Response, status
+from models.idempotency import IdempotencyKey
+from sqlalchemy import delete, event, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+class IdempotencyRecord(NamedTuple):
+    fingerprint: str
+    status_code: Optional[int] = None
+    body: Optional[bytes] = None
+    lease_expired: bool = False
+
+
+class IdempotencyStore:
+    async def claim(self, db: AsyncSession, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        raise NotImplementedError
+
+    def complete_on_commit(self, db: AsyncSession, key: str, status_code: int) -> Callable[[], None]:
+        return lambda: None
+
+    async def complete(self, db: AsyncSession, key: str, status_code: int, body: bytes) -> None:
+        raise NotImplementedError
+
+    async def release(self, db: AsyncSession, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self, maxsize: int = 10_000, ttl: float = 86_400):
+        self._records = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def claim(self, db: AsyncSession, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        existing = self._records.get(key)
+        if existing is not None:
+            return existing
+        self._records.set(key, IdempotencyRecord(fingerprint))
+        return None
+
+    async def complete(self, db: AsyncSession, key: str, status_code: int, body: bytes) -> None:
+        existing = self._records.get(key)
+        if existing is not None:
+            self._records.set(key, existing._replace(status_code=status_code, body=body))
+
+    async def release(self, db: AsyncSession, key: str) -> None:
+        self._records.delete(key)
+
+
+class SQLIdempotencyStore(IdempotencyStore):
+    def __init__(self, ttl: float = 86_400, lease: float = 30):
+        self.ttl = ttl
+        self.lease = lease
+
+    async def _get(self, db: AsyncSession, key: str) -> Optional[IdempotencyRecord]:
+        now = datetime.now(timezone.utc)
+        row = (
+            await db.execute(
+                select(
+                    IdempotencyKey.fingerprint,
+                    IdempotencyKey.status_code,
+                    IdempotencyKey.response_body,
+                    IdempotencyKey.locked_until <= now,
+                ).where(IdempotencyKey.key == key, IdempotencyKey.expires_at > now)
+            )
+        ).one_or_none()
+        return IdempotencyRecord(row[0], row[1], row[2], bool(row[3])) if row is not None else None
+
+    async def claim(self, db: AsyncSession, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        existing = await self._get(db, key)
+        if existing is not None:
+            if existing.status_code is None and existing.lease_expired and existing.fingerprint == fingerprint:
+                return await self._take_over(db, key, fingerprint)
+            return existing
+
+        now = datetime.now(timezone.utc)
+        # The unique key makes the insert the lock: a concurrent duplicate loses here instead of running twice
+        await db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.expires_at <= now))
+        db.add(
+            IdempotencyKey(
+                key=key,
+                fingerprint=fingerprint,
+                locked_until=now + timedelta(seconds=self.lease),
+                expires_at=now + timedelta(seconds=self.ttl),
+            )
+        )
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return await self._get(db, key) or IdempotencyRecord(fingerprint)
+        return None
+
+    async def _take_over(self, db: AsyncSession, key: str, fingerprint: str) -> Optional[IdempotencyRecord]:
+        # The previous holder died before its business commit; only one retry wins the conditional update
+        now = datetime.now(timezone.utc)
+        result = await db.execute(
+            update(IdempotencyKey)
+            .where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.status_code.is_(None),
+                IdempotencyKey.locked_until <= now,
+            )
+            .values(locked_until=now + timedelta(seconds=self.lease))
+        )
+        await db.commit()
+        if result.rowcount == 1:
+            logger.warning(f"Took over idempotency key {key} after its lease expired")
+            return None
+        return await self._get(db, key) or IdempotencyRecord(fingerprint)
+
+    def complete_on_commit(self, db: AsyncSession, key: str, status_code: int) -> Callable[[], None]:
+        # Flag the key as done inside the business transaction, so a crash before complete() can never
+        # let a retry run the write a second time
+        def mark_completed(session):
+            session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(status_code=status_code, locked_until=None)
+            )
+
+        event.listen(db.sync_session, "before_commit", mark_completed, once=True)
+
+        def detach():
+            if event.contains(db.sync_session, "before_commit", mark_completed):
+                event.remove(db.sync_session, "before_commit", mark_completed)
+
+        return detach
+
+    async def complete(self, db: AsyncSession, key: str, status_code: int, body: bytes) -> None:
+        await db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key)
+            .values(status_code=status_code, response_body=body, locked_until=None)
+        )
+        await db.commit()
+
+    async def release(self, db: AsyncSession, key: str) -> None:
+        # Keys whose business write already committed stay, so the write is never repeated
+        await db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None)))
+        await db.commit()
+
+
+def create_idempotency_store(backend: str) -> IdempotencyStore:
+    if backend == "memory":
+        return MemoryIdempotencyStore(maxsize=settings.IDEMPOTENCY_MAX_KEYS, ttl=settings.IDEMPOTENCY_TTL_SECONDS)
+    return SQLIdempotencyStore(ttl=settings.IDEMPOTENCY_TTL_SECONDS, lease=settings.IDEMPOTENCY_LEASE_SECONDS)
+
+
+idempotency_store = create_idempotency_store(settings.IDEMPOTENCY_BACKEND)
+
+
+async def run_idempotent(
+    request: Request,
+    db: AsyncSession,
+    scope: str,
+    execute: Callable[[], Awaitable[Any]],
+    serializer: Callable[[Any], bytes],
+    status_code: int = status.HTTP_200_OK,
+):
+    idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
+    if not idempotency_key:
+        return await execute()
+    if len(idempotency_key) > 128:
+        raise HTTPException(status_code=400, detail=f"{IDEMPOTENCY_HEADER} must be at most 128 characters")
+
+    key = f"{scope}:{request.url.path}:{idempotency_key}"
+    digest = hashlib.sha256(f"{request.method} {request.url.path}?{request.url.query}\n".encode())
+    digest.update(await request.body())
+    fingerprint = digest.hexdigest()
+
+    existing = await idempotency_store.claim(db, key, fingerprint)
+    if existing is not None:
+        if existing.fingerprint != fingerprint:
+            raise HTTPException(status_code=422, detail=f"{IDEMPOTENCY_HEADER} was already used for another request")
+        if existing.status_code is None:
+            raise HTTPException(
+                status_code=409,
+                detail=f"A request with this {IDEMPOTENCY_HEADER} is still in progress",
+                headers={"Retry-After": "1"},
+            )
+        if existing.body is None:
+            raise HTTPException(
+                status_code=409,
+                detail=f"A request with this {IDEMPOTENCY_HEADER} was already processed, but its response was lost",
+            )
+        logger.info(f"Replaying stored response for idempotency key {key}")
+        return Response(
+            content=existing.body,
+            status_code=existing.status_code,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    detach = idempotency_store.complete_on_commit(db, key, status_code)
+    try:
+        result = await execute()
+    except Exception:
+        detach()
+        await idempotency_store.release(db, key)
+        raise
+    detach()
+
+    body = serializer(result)
+    await idempotency_store.complete(db, key, status_code, body)
+    return Response(content=body, status_code=status_code, media_type="application/json")
@@ -0,0 +1,135 @@
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from core.settings import settings
+from pydantic import TypeAdapter
+from schemas.menu import MenuCatalogResponse, MenuResponse
+from schemas.menu_item import MenuItemResponse
+from utils.cache import create_cache_backend
+from utils.compression import precompress
+from utils.http import make_etag
+
+menu_cache = create_cache_backend(
+    settings.CACHE_REDIS_URL,
+    maxsize=settings.MENU_CACHE_MAX_SIZE,
+    ttl=settings.MENU_CACHE_TTL_SECONDS,
+    prefix="menu:",
+)
+
+_menu_list_adapter = TypeAdapter(List[MenuResponse])
+_catalog_adapter = TypeAdapter(List[MenuCatalogResponse])
+
+
+class CachedPayload(NamedTuple):
+    etag: str
+    body: bytes
+    # Content-Encoding -> compressed body, built once when the entry is cached
+    encoded: Dict[str, bytes] = {}
+
+    def encode(self) -> bytes:
+        # etag \n "gzip:123,br:98" \n body followed by each compressed variant in that order
+        lengths = ",".join(f"{encoding}:{len(blob)}" for encoding, blob in self.encoded.items())
+        return b"\n".join((self.etag.encode(), lengths.encode(), self.body + b"".join(self.encoded.values())))
+
+    @classmethod
+    def decode(cls, raw: bytes) -> "CachedPayload":
+        parts = raw.split(b"\n", 2)
+        if len(parts) == 2:
+            # Entry written before compressed variants were cached
+            return cls(parts[0].decode(), parts[1])
+        etag, lengths, data = parts
+        encoded = {}
+        end = len(data)
+        for item in reversed(lengths.decode().split(",") if lengths else []):
+            encoding, size = item.split(":")
+            encoded[encoding] = data[end - int(size) : end]
+            end -= int(size)
+        return cls(etag.decode(), data[:end], dict(reversed(encoded.items())))
+
+
+def menu_key(menu_id: int) -> str:
+    return f"menu:{menu_id}"
+
+
+def branch_menus_key(branch_id: int) -> str:
+    return f"branch:{branch_id}:menus"
+
+
+def menu_item_key(menu_item_id: int) -> str:
+    return f"item:{menu_item_id}"
+
+
+def branch_catalog_key(branch_id: int) -> str:
+    return f"branch:{branch_id}:catalog"
+
+
+def serialize_menu(menu) -> bytes:
+    return MenuResponse.model_validate(menu).model_dump_json().encode()
+
+
+def serialize_menus(menus) -> bytes:
+    return _menu_list_adapter.dump_json(_menu_list_adapter.validate_python(menus, from_attributes=True))
+
+
+def serialize_menu_item(menu_item) -> bytes:
+    return MenuItemResponse.model_validate(menu_item).model_dump_json().encode()
+
+
+def serialize_catalog(menus) -> bytes:
+    return _catalog_adapter.dump_json(_catalog_adapter.validate_python(menus, from_attributes=True))
+
+
+def catalog_rows(menus) -> Iterable:
+    for menu in menus:
+        yield menu
+        yield from menu.menu_item
+
+
+# Loaders must read from the primary: a lagging replica would put data back that an invalidation just removed.
+# The session is only checked out on a miss.
+async def get_or_load(
+    key: str,
+    loader: Callable[[], Awaitable],
+    serializer: Callable[..., bytes],
+    etag_rows: Optional[Callable[..., Iterable]] = None,
+) -> CachedPayload:
+    raw = await menu_cache.get(key)
+    if raw is not None:
+        return CachedPayload.decode(raw)
+
+    loaded = await loader()
+    if etag_rows is not None:
+        rows = etag_rows(loaded)
+    else:
+        rows = loaded if isinstance(loaded, list) else [loaded]
+    body = serializer(loaded)
+    payload = CachedPayload(
+        make_etag(*rows),
+        body,
+        precompress(body, settings.COMPRESSION_MIN_SIZE, settings.COMPRESSION_CACHED_LEVEL)
+        if settings.COMPRESSION_ENABLED
+        else {},
+    )
+    await menu_cache.set(key, payload.encode())
+    return payload
+
+
+def _branch_keys(branch_ids: Iterable[int]) -> List[str]:
+    keys = []
+    for branch_id in set(branch_ids):
+        keys.extend((branch_menus_key(branch_id), branch_catalog_key(branch_id)))
+    return keys
+
+
+async def invalidate_menu(menu_id: int, *branch_ids: int) -> None:
+    await menu_cache.delete(menu_key(menu_id), *_branch_keys(branch_ids))
+
+
+async def invalidate_branch_menus(branch_id: int) -> None:
+    await menu_cache.delete(*_branch_keys([branch_id]))
+
+
+async def invalidate_menu_item(menu_item_id: int, branch_id: Optional[int] = None) -> None:
+    keys = [menu_item_key(menu_item_id)]
+    if branch_id is not None:
+        keys.append(branch_catalog_key(branch_id))
+    await menu_cache.delete(*keys)
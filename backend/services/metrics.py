@@ -0,0 +1,93 @@
+import re
+import time
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_invalid_name_chars = re.compile(r"[^a-zA-Z0-9_]")
+
+
+class RouteHistogram:
+    __slots__ = ("buckets", "count", "total")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+
+
+class RequestMetrics:
+    # Every update happens on the event loop thread between awaits, so plain ints need no locking
+    def __init__(self):
+        self.started_at = time.time()
+        self.in_flight = 0
+        self.histograms: dict[tuple[str, str], RouteHistogram] = {}
+        self.responses: dict[tuple[str, str, int], int] = {}
+
+    def observe(self, method: str, route: str, status_code: int, seconds: float) -> None:
+        key = (method, route)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = RouteHistogram()
+        histogram.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        histogram.count += 1
+        histogram.total += seconds
+
+        status_key = (method, route, status_code)
+        self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+    def reset(self) -> None:
+        self.in_flight = 0
+        self.histograms.clear()
+        self.responses.clear()
+
+    def render(self) -> list[str]:
+        lines = [
+            "# HELP http_requests_in_flight Requests currently being served by this worker.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP http_requests_total Responses sent, by route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status_code), count in sorted(self.responses.items()):
+            lines.append(f'http_requests_total{{method="{method}",route="{route}",status="{status_code}"}} {count}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency, by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route), histogram in sorted(self.histograms.items()):
+            labels = f'method="{method}",route="{route}"'
+            cumulative = 0
+            for bound, bucket in zip(LATENCY_BUCKETS, histogram.buckets):
+                cumulative += bucket
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {histogram.total:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {histogram.count}")
+
+        lines += [
+            "# TYPE process_start_time_seconds gauge",
+            f"process_start_time_seconds {self.started_at:.3f}",
+        ]
+        return lines
+
+
+request_metrics = RequestMetrics()
+
+
+def _flatten(prefix: str, value, out: list[str]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{prefix}_{key}", item, out)
+    elif isinstance(value, (bool, int, float)):
+        name = _invalid_name_chars.sub("_", prefix)
+        out.append(f"# TYPE {name} gauge")
+        out.append(f"{name} {float(value)}")
+
+
+def render_prometheus(snapshot: dict) -> str:
+    lines = request_metrics.render()
+    for section, value in snapshot.items():
+        _flatten(f"app_{section}", value, lines)
+    return "\n".join(lines) + "\n"
@@ -1,7 +1,133 @@
 import random
 import string
+import threading
+import time
 
+from core.settings import settings
 
-def generate_order_id() -> str:
+# 2024-01-01T00:00:00Z; 41 bits of milliseconds from here last until 2093
+SNOWFLAKE_EPOCH_MS = 1_704_067_200_000
+NODE_BITS = 10
+SEQUENCE_BITS = 12
+MAX_NODE_ID = (1 << NODE_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
+def worker_node_id(slot: int) -> int:
+    if settings.ORDER_ID_NODE_ID is not None:
+        return settings.ORDER_ID_NODE_ID
+    node_id = settings.ORDER_ID_NODE_BASE + slot
+    if node_id > MAX_NODE_ID:
+        raise ValueError(f"ORDER_ID_NODE_BASE + worker slot {slot} exceeds the snowflake node limit {MAX_NODE_ID}")
+    return node_id
+
+
+def claim_worker_slot(live_slots) -> int:
+    # Lowest slot no running worker holds, so a recycled worker takes over its predecessor's node
+    slot = 0
+    while slot in live_slots:
+        slot += 1
+    return slot
+
+
+def validate_worker_nodes(workers: int) -> None:
+    if settings.ORDER_ID_STRATEGY != "snowflake":
+        return
+    if settings.ORDER_ID_NODE_ID is not None and workers > 1:
+        raise ValueError(
+            f"ORDER_ID_NODE_ID pins one snowflake node but {workers} workers would share it; "
+            "set ORDER_ID_NODE_BASE instead"
+        )
+    worker_node_id(workers - 1)
+
+
+class SnowflakeGenerator:
+    def __init__(self, node_id: int):
+        if not 0 <= node_id <= MAX_NODE_ID:
+            raise ValueError(f"node_id must be between 0 and {MAX_NODE_ID}")
+        self.node_id = node_id
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        with self._lock:
+            # Never step backwards if the wall clock does; keep counting on the last timestamp instead
+            now = max(_now_ms(), self._last_ms)
+            if now == self._last_ms:
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    # Sequence exhausted for this millisecond: move on to the next one
+                    now += 1
+            else:
+                self._sequence = 0
+            self._last_ms = now
+            return (
+                ((now - SNOWFLAKE_EPOCH_MS) << (NODE_BITS + SEQUENCE_BITS))
+                | (self.node_id << SEQUENCE_BITS)
+                | (self._sequence)
+            )
+
+    def __call__(self) -> str:
+        # Zero-padded so the string order in the unique index matches the numeric order
+        return f"order#{self.next_id():019d}"
+
+
+class ULIDGenerator:
+    def __init__(self):
+        self._last_ms = -1
+        self._last_random = 0
+        self._lock = threading.Lock()
+
+    def next_value(self) -> int:
+        with self._lock:
+            now = max(_now_ms(), self._last_ms)
+            if now == self._last_ms:
+                # Monotonic ULID: bump the random part within the same millisecond
+                self._last_random += 1
+                if self._last_random >> 80:
+                    now += 1
+                    self._last_random = random.getrandbits(79)
+            else:
+                self._last_random = random.getrandbits(79)
+            self._last_ms = now
+            return (now << 80) | self._last_random
+
+    def __call__(self) -> str:
+        value = self.next_value()
+        encoded = "".join(CROCKFORD_BASE32[(value >> shift) & 31] for shift in range(125, -1, -5))
+        return f"order#{encoded}"
+
+
+def legacy_order_id() -> str:
     suffix = "".join(random.choices(string.digits, k=4))
     return f"order#{suffix}"
+
+
+def create_order_id_generator(strategy: str, node_id: int | None = None):
+    if strategy == "snowflake":
+        return SnowflakeGenerator(settings.ORDER_ID_NODE_BASE if node_id is None else node_id)
+    if strategy == "ulid":
+        return ULIDGenerator()
+    if strategy == "legacy":
+        return legacy_order_id
+    raise ValueError(f"Unknown order id strategy: {strategy}")
+
+
+_generator = create_order_id_generator(settings.ORDER_ID_STRATEGY, settings.ORDER_ID_NODE_ID)
+
+
+def reset_order_id_generator(node_id: int) -> None:
+    # Called from gunicorn post_fork with the node derived from the worker's slot
+    global _generator
+    _generator = create_order_id_generator(settings.ORDER_ID_STRATEGY, node_id)
+
+
+def generate_order_id() -> str:
+    return _generator()
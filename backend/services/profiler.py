@@ -0,0 +1,76 @@
+import cProfile
+import io
+import pstats
+import random
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class RequestProfiler:
+    def __init__(self, max_profiles: int = 20):
+        self.enabled = False
+        self.sample_rate = 0.0
+        self.path_prefix = "/"
+        self.remaining = 0
+        self.profiles: deque = deque(maxlen=max_profiles)
+        self._busy = False
+
+    def start(self, sample_rate: float, path_prefix: str, max_requests: int) -> None:
+        self.sample_rate = sample_rate
+        self.path_prefix = path_prefix
+        self.remaining = max_requests
+        self.enabled = True
+
+    def stop(self) -> None:
+        self.enabled = False
+        self.remaining = 0
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "path_prefix": self.path_prefix,
+            "remaining": self.remaining,
+            "collected": len(self.profiles),
+        }
+
+    def should_sample(self, path: str) -> bool:
+        # cProfile allows one active profiler per thread, so concurrent requests are skipped rather than queued
+        if not self.enabled or self._busy or not path.startswith(self.path_prefix):
+            return False
+        return random.random() < self.sample_rate
+
+    def begin(self) -> cProfile.Profile:
+        self._busy = True
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.enabled = False
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    def finish(self, profile: cProfile.Profile, method: str, path: str, duration_ms: float, limit: int = 40) -> None:
+        profile.disable()
+        self._busy = False
+        # The event loop keeps running other requests while this one awaits, so their frames can show up too
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        self.profiles.append(
+            {
+                "method": method,
+                "path": path,
+                "duration_ms": round(duration_ms, 3),
+                "captured_at": datetime.now(timezone.utc).isoformat(),
+                "stats": out.getvalue(),
+            }
+        )
+
+    def collected(self, path: Optional[str] = None) -> list:
+        return [p for p in self.profiles if path is None or p["path"].startswith(path)]
+
+    def clear(self) -> None:
+        self.profiles.clear()
+
+
+request_profiler = RequestProfiler()
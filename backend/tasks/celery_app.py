@@ -39,6 +39,11 @@ celery_app.conf.update(
             "task": "tasks.cleanup_tasks.cleanup_expired_codes",
             "schedule": crontab(minute="*/6"),  # Every 30 minutes
         },
+        # Expired Idempotency-Key rows (every hour)
+        "cleanup-expired-idempotency-keys": {
+            "task": "tasks.cleanup_tasks.cleanup_expired_idempotency_keys",
+            "schedule": crontab(minute=15),
+        },
     },
     beat_schedule_filename="celerybeat-schedule",
 )
@@ -57,3 +57,8 @@ def weekly_comprehensive_cleanup(self):
 @current_app.task(bind=True, max_retries=3)
 def cleanup_expired_codes(self):
     return cleanup_via_api(cleanup_type="expired_codes", days_threshold=30, dry_run=False, force=False)
+
+
+@current_app.task(bind=True, max_retries=3)
+def cleanup_expired_idempotency_keys(self):
+    return cleanup_via_api(cleanup_type="idempotency_keys", days_threshold=30, dry_run=False, force=False)
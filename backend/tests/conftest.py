@@ -1,15 +1,19 @@
-import contextlib
+import functools
 import importlib
 import os
 import pkgutil
 import sys
+from typing import NamedTuple, Sequence
 
 import httpx
+import pytest
 import pytest_asyncio
 from db.base import Base
 from dependencies.auth import require_admin
 from httpx import ASGITransport
-from sqlalchemy import event
+from models import Branch, Company, Menu, User
+from models.menu import MenuItem
+from models.user import UserRole
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
@@ -61,24 +65,63 @@ async def db_session():
     async with engine.connect() as conn:
         trans = await conn.begin()
 
+        # commit() and rollback() inside the code under test only release or roll back a savepoint; the
+        # outer transaction stays with the connection and is rolled back after the test
         async_session_maker = async_sessionmaker(
-            bind=conn, expire_on_commit=False, class_=AsyncSession, autoflush=False
+            bind=conn,
+            expire_on_commit=False,
+            class_=AsyncSession,
+            autoflush=False,
+            join_transaction_mode="create_savepoint",
         )
         async with async_session_maker() as session:
-            nested = await session.begin_nested()
-
-            @event.listens_for(session.sync_session, "after_transaction_end")
-            def _restart_savepoint(sess, trans_):
-                if trans_.nested and not trans_._parent.nested:
-                    sess.begin_nested()
-
             try:
                 yield session
             finally:
-                with contextlib.suppress(Exception):
-                    await nested.rollback()
-                with contextlib.suppress(Exception):
-                    await trans.rollback()
+                await trans.rollback()
+
+
+class Seed(NamedTuple):
+    owner: User
+    branch: Branch
+    menu: Menu
+    items: list[MenuItem]
+
+
+# Also used by benchmarks/order_ids.py to seed its scratch database
+async def seed_branch(db, name: str, prices: Sequence[int] = (), role: UserRole = UserRole.user) -> Seed:
+    owner = User(username=f"{name}_owner", email=f"{name}@example.com", hashed_password="x", role=role)
+    db.add(owner)
+    await db.flush()
+    company = Company(
+        username=f"{name}_co", phone="1", url="u", email=f"{name}@co.com", logo="l", address="a", owner_id=owner.id
+    )
+    db.add(company)
+    await db.flush()
+    branch = Branch(
+        username=f"{name}_br",
+        phone="1",
+        url="u",
+        latitude=0,
+        longitude=0,
+        rating=5,
+        company_id=company.id,
+        owner_id=owner.id,
+    )
+    db.add(branch)
+    await db.flush()
+    menu = Menu(username=f"{name}_menu", branch_id=branch.id)
+    db.add(menu)
+    await db.flush()
+    items = [MenuItem(username=f"{name}_item{i}", price=price, menu_id=menu.id) for i, price in enumerate(prices)]
+    db.add_all(items)
+    await db.commit()
+    return Seed(owner, branch, menu, items)
+
+
+@pytest.fixture
+def seed(db_session):
+    return functools.partial(seed_branch, db_session)
 
 
 @pytest_asyncio.fixture
@@ -86,9 +129,11 @@ async def client(db_session: AsyncSession):
     async def _override_get_pg_db():
         yield db_session
 
-    from main import app, get_pg_db
+    from db.session import get_pg_db, get_read_db
+    from main import app
 
     app.dependency_overrides[get_pg_db] = _override_get_pg_db
+    app.dependency_overrides[get_read_db] = _override_get_pg_db
 
     if require_admin is not None:
 
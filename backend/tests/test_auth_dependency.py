@@ -0,0 +1,67 @@
+import pytest
+from core.security import create_user_access_token, principal_cache, token_revocations
+from crud.user import create_user, update_user_role
+from dependencies.auth import get_current_user, require_admin
+from fastapi import HTTPException
+from models.user import UserRole
+from schemas.user import UserCreate
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_get_current_user_caches_principal(db_session):
+    principal_cache.clear()
+    user = await create_user(
+        db_session, UserCreate(username="cached", email="cached@example.com", password="secret", role="user")
+    )
+    token = create_user_access_token(user)
+
+    first = await get_current_user(token, db_session)
+    hits = principal_cache.hits
+    second = await get_current_user(token, db_session)
+
+    assert first == second
+    assert first.role == UserRole.user
+    assert principal_cache.hits == hits + 1
+
+
+async def test_role_change_revokes_old_tokens(db_session):
+    user = await create_user(
+        db_session, UserCreate(username="promoted", email="promoted@example.com", password="secret", role="user")
+    )
+    old_token = create_user_access_token(user)
+
+    principal = await get_current_user(old_token, db_session)
+    assert principal.role == UserRole.user
+
+    user = await update_user_role(db_session, user.id, UserRole.branch)
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(old_token, db_session)
+    assert exc.value.status_code == 401
+
+    # The revocation entry expired, so the stored token_version has to catch it
+    await token_revocations.delete(str(user.id))
+    principal_cache.clear()
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(old_token, db_session)
+    assert exc.value.status_code == 401
+
+    new_principal = await get_current_user(create_user_access_token(user), db_session)
+    assert new_principal.role == UserRole.branch
+
+
+async def test_demoted_admin_is_rejected_despite_stale_worker_state(db_session):
+    admin = await create_user(
+        db_session, UserCreate(username="demoted", email="demoted@example.com", password="secret", role="admin")
+    )
+    token = create_user_access_token(admin)
+    stale = await get_current_user(token, db_session)
+    assert (await require_admin(stale)).role == UserRole.admin
+
+    await update_user_role(db_session, admin.id, UserRole.user)
+    # Another worker still holds the admin principal, but the revocation store is shared
+    principal_cache.set(admin.id, stale)
+
+    with pytest.raises(HTTPException) as exc:
+        await get_current_user(token, db_session)
+    assert exc.value.status_code == 401
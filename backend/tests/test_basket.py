@@ -0,0 +1,70 @@
+import pytest
+from crud.basket import create_basket
+from dependencies.auth import get_current_user
+from fastapi import HTTPException
+from models.user import UserRole
+from schemas.basket import BasketCreateSchema
+from schemas.token import Principal
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_basket_add_upserts_and_caps_quantity(db_session, seed):
+    user, _, _, (item,) = await seed("upsert", [5])
+
+    first = await create_basket(db_session, BasketCreateSchema(menu_item_id=item.id, quantity=60), user.id)
+    second = await create_basket(db_session, BasketCreateSchema(menu_item_id=item.id, quantity=60), user.id)
+
+    assert second.id == first.id
+    assert second.quantity == 99
+    assert second.menu_item.price == 5
+
+    with pytest.raises(HTTPException) as exc:
+        await create_basket(db_session, BasketCreateSchema(menu_item_id=999999), user.id)
+    assert exc.value.status_code == 404
+
+
+async def test_bulk_sync_applies_the_desired_cart(client, db_session, seed):
+    from main import app
+
+    user, _, _, (kept, dropped, added) = await seed("bulk", [2, 3, 7])
+    await create_basket(db_session, BasketCreateSchema(menu_item_id=kept.id, quantity=1), user.id)
+    await create_basket(db_session, BasketCreateSchema(menu_item_id=dropped.id, quantity=4), user.id)
+    principal = Principal(id=user.id, role=UserRole.user)
+    kept_id, added_id = kept.id, added.id
+    app.dependency_overrides[get_current_user] = lambda: principal
+
+    response = await client.put(
+        "/api/v1/baskets/bulk",
+        json={"items": [{"menu_item_id": kept_id, "quantity": 5}, {"menu_item_id": added_id, "quantity": 2}]},
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert {b["menu_item_id"]: b["quantity"] for b in body["baskets"]} == {kept_id: 5, added_id: 2}
+    assert body["total_count"] == 5 * 2 + 2 * 7
+
+    missing = await client.put("/api/v1/baskets/bulk", json={"items": [{"menu_item_id": 999999, "quantity": 1}]})
+    assert missing.status_code == 404
+
+    emptied = await client.put("/api/v1/baskets/bulk", json={"items": []})
+    assert emptied.json()["baskets"] == []
+
+
+async def test_summary_totals_the_whole_cart_in_sql(client, db_session, seed):
+    from main import app
+
+    user, _, _, items = await seed("summary", [3, 10])
+    for item, quantity in zip(items, [2, 4]):
+        await create_basket(db_session, BasketCreateSchema(menu_item_id=item.id, quantity=quantity), user.id)
+    principal = Principal(id=user.id, role=UserRole.user)
+    app.dependency_overrides[get_current_user] = lambda: principal
+
+    summary = await client.get("/api/v1/baskets/summary")
+    assert summary.status_code == 200
+    assert summary.json() == {"item_count": 2, "total_quantity": 6, "total_cost": 46}
+
+    # The list total covers the whole cart, not just the requested page
+    page = await client.get("/api/v1/baskets/?limit=1")
+    assert len(page.json()["baskets"]) == 1
+    assert page.json()["total_count"] == 46
@@ -0,0 +1,75 @@
+import gzip
+import json
+
+import httpx
+import pytest
+from core.middleware import CompressionMiddleware
+from httpx import ASGITransport
+from services.menu_cache import CachedPayload
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from utils.compression import negotiate_encoding, precompress
+from utils.http import conditional_json_response
+
+pytestmark = pytest.mark.asyncio
+
+ROWS = [{"id": i, "username": f"item-{i}", "description": "Double shot with steamed milk"} for i in range(200)]
+
+
+def _build_app():
+    async def large(request):
+        return JSONResponse(ROWS)
+
+    async def small(request):
+        return JSONResponse({"ok": True})
+
+    app = Starlette(routes=[Route("/large", large), Route("/small", small)])
+    return CompressionMiddleware(app, minimum_size=1024, level=5)
+
+
+async def test_negotiate_encoding():
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("*") in ("br", "gzip")
+    assert negotiate_encoding("") is None
+
+
+async def test_middleware_compresses_above_threshold():
+    async with httpx.AsyncClient(transport=ASGITransport(app=_build_app()), base_url="http://test") as ac:
+        large = await ac.get("/large", headers={"Accept-Encoding": "gzip"})
+        small = await ac.get("/small", headers={"Accept-Encoding": "gzip"})
+        plain = await ac.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert large.headers["content-encoding"] == "gzip"
+    assert int(large.headers["content-length"]) < len(json.dumps(ROWS))
+    assert large.json() == ROWS
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in plain.headers
+    for response in (large, small, plain):
+        assert response.headers["vary"] == "Accept-Encoding"
+
+
+async def test_cached_payload_keeps_compressed_variants():
+    body = json.dumps(ROWS).encode()
+    payload = CachedPayload('W/"abc"', body, precompress(body, 1024, 9))
+    restored = CachedPayload.decode(payload.encode())
+    assert restored == payload
+    assert gzip.decompress(restored.encoded["gzip"]) == body
+
+    legacy = CachedPayload.decode(b'W/"abc"\n{"id":1}')
+    assert legacy == CachedPayload('W/"abc"', b'{"id":1}', {})
+
+
+async def test_conditional_response_serves_precompressed_bytes():
+    body = json.dumps(ROWS).encode()
+    encoded = precompress(body, 1024, 9)
+    request = Request({"type": "http", "method": "GET", "headers": [(b"accept-encoding", b"gzip")]})
+
+    response = conditional_json_response(request, 'W/"abc"', body, encoded)
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.body is encoded["gzip"]
+    assert response.headers["vary"] == "Accept-Encoding"
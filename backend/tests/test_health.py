@@ -0,0 +1,68 @@
+import pytest
+from services.health import HealthMonitor, health_monitor
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def monitor(monkeypatch, db_session):
+    monkeypatch.setattr(health_monitor, "engine", db_session.bind.engine)
+    for attr in ("database_ok", "checked_at", "latency_ms", "error", "drain_reason", "max_requests"):
+        monkeypatch.setattr(health_monitor, attr, None)
+    monkeypatch.setattr(health_monitor, "draining", False)
+    monkeypatch.setattr(health_monitor, "requests_served", 0)
+    return health_monitor
+
+
+async def test_livez_and_readyz_use_cached_state(client, monitor):
+    assert (await client.get("/livez")).status_code == 200
+
+    response = await client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+    assert await monitor.check() is True
+    checked_at = monitor.checked_at
+    response = await client.get("/readyz")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ready"
+    assert monitor.checked_at == checked_at
+
+    monitor.start_draining("shutdown")
+    response = await client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["drain_reason"] == "shutdown"
+    assert (await client.get("/livez")).status_code == 200
+
+
+async def test_readyz_drains_before_max_requests(client, monitor):
+    await monitor.check()
+    monitor.max_requests = 10
+
+    for _ in range(4):
+        assert (await client.get("/livez")).status_code == 200
+    response = await client.get("/readyz")
+    assert response.status_code == 503
+    assert response.json()["status"] == "draining"
+
+
+async def test_failed_check_marks_unavailable():
+    broken = create_async_engine("sqlite+aiosqlite:////nonexistent/dir/db.sqlite", poolclass=NullPool)
+    monitor = HealthMonitor(broken)
+    assert await monitor.check() is False
+    assert monitor.status()["status"] == "unavailable"
+    assert monitor.error
+    await broken.dispose()
+
+
+async def test_drain_margin_is_capped_for_small_max_requests(monitor):
+    monitor.max_requests = 5
+
+    for _ in range(2):
+        monitor.note_request()
+    assert not monitor.draining
+
+    monitor.note_request()
+    assert monitor.draining
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from dependencies.auth import get_current_user
+from models import User
+from models.basket import Basket
+from models.idempotency import IdempotencyKey
+from models.user import UserRole
+from schemas.tasks import CleanupRequest
+from schemas.token import Principal
+from services import idempotency
+from services.cleanup_service import _cleanup_expired_idempotency_keys_api
+from sqlalchemy import select
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize("store", [idempotency.SQLIdempotencyStore(), idempotency.MemoryIdempotencyStore()])
+async def test_retried_basket_add_replays_without_writing_twice(client, db_session, seed, monkeypatch, store):
+    from main import app
+
+    monkeypatch.setattr(idempotency, "idempotency_store", store)
+    user, _, _, (item,) = await seed(f"idem{type(store).__name__.lower()}", [4])
+    app.dependency_overrides[get_current_user] = lambda: Principal(id=user.id, role=UserRole.user)
+    url = f"/api/v1/baskets/?user_id={user.id}"
+    headers = {"Idempotency-Key": "retry-1"}
+
+    first = await client.post(url, json={"menu_item_id": item.id, "quantity": 2}, headers=headers)
+    retry = await client.post(url, json={"menu_item_id": item.id, "quantity": 2}, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    quantity = await db_session.scalar(
+        select(Basket.quantity).where(Basket.user_id == user.id, Basket.menu_item_id == item.id)
+    )
+    assert quantity == 2
+
+    reused = await client.post(url, json={"menu_item_id": item.id, "quantity": 3}, headers=headers)
+    assert reused.status_code == 422
+
+
+async def test_stale_claim_is_taken_over_after_its_lease(db_session):
+    held = idempotency.SQLIdempotencyStore(lease=30)
+    assert await held.claim(db_session, "lease:held", "fp") is None
+    in_progress = await held.claim(db_session, "lease:held", "fp")
+    assert in_progress.status_code is None and not in_progress.lease_expired
+
+    expired = idempotency.SQLIdempotencyStore(lease=0)
+    assert await expired.claim(db_session, "lease:stale", "fp") is None
+    assert await expired.claim(db_session, "lease:stale", "fp") is None
+    assert (await expired.claim(db_session, "lease:stale", "other")).fingerprint == "fp"
+
+
+async def test_completion_commits_with_the_business_write(db_session):
+    store = idempotency.SQLIdempotencyStore(lease=0)
+    assert await store.claim(db_session, "crash:1", "fp") is None
+
+    detach = store.complete_on_commit(db_session, "crash:1", 201)
+    db_session.add(User(username="crash_user", email="crash@example.com", hashed_password="x", role=UserRole.user))
+    await db_session.commit()
+    detach()
+    # The worker dies here, before complete() stores the response body
+
+    record = await store.claim(db_session, "crash:1", "fp")
+    assert record.status_code == 201 and record.body is None
+    await store.release(db_session, "crash:1")
+    assert (await store.claim(db_session, "crash:1", "fp")).status_code == 201
+
+
+async def test_expired_keys_are_purged(db_session):
+    now = datetime.now(timezone.utc)
+    db_session.add_all(
+        [
+            IdempotencyKey(key="purge:old", fingerprint="fp", expires_at=now - timedelta(hours=1)),
+            IdempotencyKey(key="purge:new", fingerprint="fp", expires_at=now + timedelta(hours=1)),
+        ]
+    )
+    await db_session.commit()
+
+    result = await _cleanup_expired_idempotency_keys_api(db_session, CleanupRequest())
+
+    assert result["deleted_idempotency_keys"] >= 1
+    keys = set(await db_session.scalars(select(IdempotencyKey.key).where(IdempotencyKey.key.like("purge:%"))))
+    assert keys == {"purge:new"}
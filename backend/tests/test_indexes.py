@@ -0,0 +1,46 @@
+import pytest
+from models import Menu, Order, User
+from models.menu import MenuItem
+from sqlalchemy import select, text
+
+pytestmark = pytest.mark.asyncio
+
+HOT_QUERIES = [
+    (
+        select(Order)
+        .where(Order.is_active == True, Order.branch_id == 1)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(101),
+        "ix_order_branch_id_created_at_id",
+    ),
+    (
+        select(Order)
+        .where(Order.is_active == True, Order.user_id == 1)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(101),
+        "ix_order_user_id_created_at_id",
+    ),
+    (
+        select(Menu)
+        .where(Menu.branch_id == 1, Menu.is_active == True)
+        .order_by(Menu.created_at.desc(), Menu.id.desc()),
+        "ix_menu_branch_id_created_at_id",
+    ),
+    (
+        select(MenuItem).where(MenuItem.menu_id.in_([1, 2]), MenuItem.is_active == True),
+        "ix_menu_item_menu_id_active",
+    ),
+    (
+        select(User).where(User.is_active == True).order_by(User.created_at.desc(), User.id.desc()).limit(101),
+        "ix_user_created_at_id",
+    ),
+]
+
+
+@pytest.mark.parametrize("query,index_name", HOT_QUERIES, ids=[name for _, name in HOT_QUERIES])
+async def test_hot_queries_use_their_index(db_session, query, index_name):
+    compiled = query.compile(dialect=db_session.bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = (await db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))).all()
+
+    details = " | ".join(row[-1] for row in plan)
+    assert index_name in details, details
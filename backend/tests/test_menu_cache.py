@@ -0,0 +1,109 @@
+import json
+
+import pytest
+from crud.branch import delete_branch
+from crud.menu import get_menu, patch_menu
+from crud.menu_item import create_menu_item
+from dependencies.auth import get_current_user
+from models.menu import MenuItem
+from models.user import UserRole
+from schemas.menu import MenuPatch
+from schemas.menu_item import MenuItemCreate
+from services import menu_cache
+from utils.cache import MemoryCacheBackend, RedisCacheBackend
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.mark.parametrize("backend", [MemoryCacheBackend(), RedisCacheBackend(FakeRedis())])
+async def test_menu_reads_are_cached_until_patched(db_session, seed, monkeypatch, backend):
+    monkeypatch.setattr(menu_cache, "menu_cache", backend)
+    menu = (await seed(f"cache{type(backend).__name__.lower()}", role=UserRole.branch)).menu
+    key = menu_cache.menu_key(menu.id)
+
+    def load():
+        return get_menu(db_session, menu.id)
+
+    first = await menu_cache.get_or_load(key, load, menu_cache.serialize_menu)
+    second = await menu_cache.get_or_load(key, load, menu_cache.serialize_menu)
+    assert first == second
+    assert first.etag.startswith('W/"')
+    assert backend.hits == 1 and backend.misses == 1
+
+    await patch_menu(db_session, menu.id, MenuPatch(description="seasonal"))
+
+    refreshed = await menu_cache.get_or_load(key, load, menu_cache.serialize_menu)
+    assert json.loads(refreshed.body)["description"] == "seasonal"
+    assert refreshed.etag != first.etag
+    assert backend.misses == 2
+
+
+async def test_menu_endpoint_answers_matching_etag_with_304(client, db_session, seed, monkeypatch):
+    from main import app
+
+    monkeypatch.setattr(menu_cache, "menu_cache", MemoryCacheBackend())
+    app.dependency_overrides[get_current_user] = lambda: None
+    menu = (await seed("etag", role=UserRole.branch)).menu
+
+    first = await client.get(f"/api/v1/menus/{menu.id}")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    cached = await client.get(f"/api/v1/menus/{menu.id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    await patch_menu(db_session, menu.id, MenuPatch(description="changed"))
+    changed = await client.get(f"/api/v1/menus/{menu.id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+async def test_branch_catalog_lists_available_items_and_refreshes(client, db_session, seed, monkeypatch):
+    from main import app
+
+    monkeypatch.setattr(menu_cache, "menu_cache", MemoryCacheBackend())
+    app.dependency_overrides[get_current_user] = lambda: None
+    menu = (await seed("catalog", role=UserRole.branch)).menu
+    db_session.add_all(
+        [
+            MenuItem(username="catalog_tea", price=3, menu_id=menu.id),
+            MenuItem(username="catalog_soldout", price=4, is_available=False, menu_id=menu.id),
+        ]
+    )
+    await db_session.commit()
+
+    first = await client.get(f"/api/v1/branches/{menu.branch_id}/catalog")
+    assert first.status_code == 200
+    catalog = first.json()
+    assert [m["id"] for m in catalog] == [menu.id]
+    assert [item["username"] for item in catalog[0]["items"]] == ["catalog_tea"]
+
+    await create_menu_item(db_session, MenuItemCreate(username="catalog_coffee", price=5, menu_id=menu.id))
+    refreshed = await client.get(
+        f"/api/v1/branches/{menu.branch_id}/catalog", headers={"If-None-Match": first.headers["etag"]}
+    )
+    assert refreshed.status_code == 200
+    assert {item["username"] for item in refreshed.json()[0]["items"]} == {"catalog_tea", "catalog_coffee"}
+
+    missing = await client.get("/api/v1/branches/999999/catalog")
+    assert missing.status_code == 404
+
+    await delete_branch(menu.branch_id, db_session)
+    deleted = await client.get(f"/api/v1/branches/{menu.branch_id}/catalog")
+    assert deleted.status_code == 404
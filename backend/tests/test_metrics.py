@@ -0,0 +1,29 @@
+import pytest
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_prometheus_metrics_per_route(client):
+    await client.get("/ping")
+    await client.get("/api/v1/orders/999999999")
+    await client.get("/no-such-path")
+
+    response = await client.get("/metrics", headers={"Accept": "text/plain;version=0.0.4;q=0.5,*/*;q=0.1"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/ping",status="200"}' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/ping",le="+Inf"}' in body
+    assert 'route="/api/v1/orders/{order_id}"' in body
+    assert 'route="unmatched",status="404"' in body
+    assert "http_requests_in_flight 1" in body
+    assert "app_principal_cache_hits " in body
+
+
+async def test_metrics_json_by_default(client):
+    response = await client.get("/metrics")
+    assert response.headers["content-type"] == "application/json"
+    assert "principal_cache" in response.json()
+
+    response = await client.get("/metrics", params={"format": "prometheus"})
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
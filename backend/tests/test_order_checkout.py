@@ -0,0 +1,31 @@
+import pytest
+from crud.order import create_order
+from models.basket import Basket
+from models.menu import MenuItem
+from models.order import OrderItem
+from schemas.order import OrderCreate
+from sqlalchemy import func, select
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_checkout_moves_every_basket_line_into_the_order(db_session, seed):
+    user, branch, menu, _ = await seed("checkout")
+    # More lines than get_baskets' default page, which the old checkout silently truncated
+    items = [MenuItem(username=f"checkout_item{i}", price=i + 1, menu_id=menu.id) for i in range(120)]
+    db_session.add_all(items)
+    await db_session.flush()
+    db_session.add_all(Basket(user_id=user.id, menu_item_id=item.id, quantity=2) for item in items)
+    await db_session.commit()
+
+    order = await create_order(db_session, OrderCreate(user_id=user.id, branch_id=branch.id))
+
+    assert order.total_amount == 2 * sum(range(1, 121))
+    line_count, line_total = (
+        await db_session.execute(
+            select(func.count(OrderItem.id), func.sum(OrderItem.total_price)).where(OrderItem.order_id == order.id)
+        )
+    ).one()
+    assert line_count == 120
+    assert line_total == order.total_amount
+    assert await db_session.scalar(select(func.count(Basket.id)).where(Basket.user_id == user.id)) == 0
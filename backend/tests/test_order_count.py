@@ -0,0 +1,35 @@
+import pytest
+from crud import order as order_crud
+from models.order import Order
+from models.user import UserRole
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_order_count_strategies(db_session, seed):
+    order_crud._order_count_cache.clear()
+    owner, branch, _, _ = await seed("count", role=UserRole.branch)
+    db_session.add_all(
+        Order(username=f"count-{i}", branch_id=branch.id, user_id=owner.id, total_amount=10, is_active=i < 3)
+        for i in range(5)
+    )
+    await db_session.commit()
+
+    exact = await order_crud.get_orders(db_session, branch_id=branch.id, limit=2, count_strategy="exact")
+    assert exact["total_count"] == 3
+    assert exact["has_more"] is True
+
+    skipped = await order_crud.get_orders(db_session, branch_id=branch.id, limit=5, count_strategy="none")
+    assert skipped["total_count"] is None
+    assert skipped["has_more"] is False
+
+    # SQLite has no planner statistics to read, so the estimate falls back to an exact count
+    estimated = await order_crud.get_orders(db_session, branch_id=branch.id, count_strategy="estimated")
+    assert estimated["total_count"] == 3
+
+    cached = await order_crud.get_orders(db_session, branch_id=branch.id, count_strategy="cached")
+    assert cached["total_count"] == 3
+    db_session.add(Order(username="count-late", branch_id=branch.id, user_id=1, total_amount=1))
+    await db_session.commit()
+    still_cached = await order_crud.get_orders(db_session, branch_id=branch.id, count_strategy="cached")
+    assert still_cached["total_count"] == 3
@@ -0,0 +1,56 @@
+import pytest
+from services import order as order_ids
+
+
+@pytest.mark.parametrize("strategy", ["snowflake", "ulid"])
+def test_order_ids_are_unique_and_sorted(strategy):
+    generate = order_ids.create_order_id_generator(strategy, node_id=7)
+    ids = [generate() for _ in range(20_000)]
+
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+
+
+def test_snowflake_survives_clock_rollback_and_sequence_overflow(monkeypatch):
+    now = [order_ids.SNOWFLAKE_EPOCH_MS + 1000]
+    monkeypatch.setattr(order_ids, "_now_ms", lambda: now[0])
+    generator = order_ids.SnowflakeGenerator(node_id=5)
+
+    first = [generator.next_id() for _ in range(order_ids.MAX_SEQUENCE + 2)]
+    now[0] -= 500
+    later = generator.next_id()
+
+    assert first == sorted(set(first))
+    assert later > first[-1]
+    assert (later >> order_ids.SEQUENCE_BITS) & order_ids.MAX_NODE_ID == 5
+
+
+def test_forked_workers_get_distinct_snowflake_nodes(monkeypatch):
+    monkeypatch.setattr(order_ids.settings, "ORDER_ID_NODE_BASE", 16)
+    monkeypatch.setattr(order_ids.settings, "ORDER_ID_NODE_ID", None)
+    monkeypatch.setattr(order_ids, "_now_ms", lambda: order_ids.SNOWFLAKE_EPOCH_MS + 1000)
+
+    # What gunicorn's pre_fork/post_fork hooks do for two workers, then for a recycled first worker
+    first = order_ids.claim_worker_slot(set())
+    second = order_ids.claim_worker_slot({first})
+    assert order_ids.claim_worker_slot({second}) == first
+    generators = [
+        order_ids.create_order_id_generator("snowflake", order_ids.worker_node_id(s)) for s in (first, second)
+    ]
+
+    ids = [generate() for generate in generators for _ in range(1000)]
+    assert len(set(ids)) == len(ids)
+    assert {g.node_id for g in generators} == {16, 17}
+
+
+def test_fixed_node_id_is_rejected_for_several_workers(monkeypatch):
+    monkeypatch.setattr(order_ids.settings, "ORDER_ID_STRATEGY", "snowflake")
+    monkeypatch.setattr(order_ids.settings, "ORDER_ID_NODE_ID", 3)
+    order_ids.validate_worker_nodes(1)
+    with pytest.raises(ValueError):
+        order_ids.validate_worker_nodes(2)
+
+    monkeypatch.setattr(order_ids.settings, "ORDER_ID_NODE_ID", None)
+    monkeypatch.setattr(order_ids.settings, "ORDER_ID_NODE_BASE", 1020)
+    with pytest.raises(ValueError):
+        order_ids.validate_worker_nodes(8)
@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+from models import User
+from models.user import UserRole
+from sqlalchemy import select
+from utils.pagination import decode_cursor, encode_cursor, paginate
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_cursor_pages_walk_every_row_once(db_session):
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(7):
+        db_session.add(
+            User(
+                username=f"page{i}",
+                email=f"page{i}@example.com",
+                hashed_password="x",
+                role=UserRole.user,
+                # Pairs share a timestamp so the id tiebreaker is exercised
+                created_at=base + timedelta(minutes=i // 2),
+            )
+        )
+    await db_session.commit()
+    query = select(User).where(User.username.like("page%"))
+
+    seen, cursor = [], None
+    for _ in range(4):
+        users, next_cursor = await paginate(db_session, query, User, limit=3, cursor=cursor)
+        seen.extend(user.username for user in users)
+        if next_cursor is None:
+            break
+        assert next_cursor != cursor
+        cursor = next_cursor
+    else:
+        pytest.fail("cursor pagination did not terminate")
+
+    assert sorted(seen) == [f"page{i}" for i in range(7)]
+    assert seen[:2] == ["page6", "page5"]
+
+    offset_page, offset_cursor = await paginate(db_session, query, User, skip=3, limit=3)
+    assert [user.username for user in offset_page] == seen[3:6]
+    assert offset_cursor is not None
+
+
+async def test_cursor_round_trip_and_rejects_garbage():
+    created_at = datetime(2026, 10, 17, 12, 0, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("not-a-cursor")
+    assert exc.value.status_code == 400
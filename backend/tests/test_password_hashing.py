@@ -0,0 +1,42 @@
+import pytest
+from core import security
+from core.settings import settings
+from fastapi import HTTPException
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_hash_and_verify_run_in_executor():
+    hashed = await security.get_password_hash_async("secret")
+
+    assert await security.verify_password_async("secret", hashed)
+    assert not await security.verify_password_async("wrong", hashed)
+    assert security.hash_stats["verify"]["count"] >= 2
+
+
+async def test_saturated_pool_returns_503(monkeypatch):
+    limit = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE
+    monkeypatch.setitem(security.hash_stats, "in_flight", limit)
+
+    with pytest.raises(HTTPException) as exc:
+        await security.verify_password_async("secret", "not-a-hash")
+
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == "1"
+
+
+async def test_outdated_hash_is_scheduled_for_rehash(monkeypatch):
+    rehashed = []
+
+    async def _fake_rehash(user_id, plain, old_hash):
+        rehashed.append((user_id, plain, old_hash))
+
+    monkeypatch.setattr(security, "_rehash_password", _fake_rehash)
+    outdated = security.pwd_context.handler("bcrypt").using(rounds=settings.BCRYPT_ROUNDS - 1).hash("secret")
+
+    security.schedule_password_rehash(7, "secret", security.get_password_hash("secret"))
+    security.schedule_password_rehash(7, "secret", outdated)
+    for task in list(security._rehash_tasks):
+        await task
+
+    assert rehashed == [(7, "secret", outdated)]
@@ -0,0 +1,81 @@
+import logging
+
+import httpx
+import pytest
+from core.middleware import QueryStatsMiddleware
+from core.settings import settings
+from db.session import InstrumentedQueuePool, instrument_engine
+from httpx import ASGITransport
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+pytestmark = pytest.mark.asyncio
+
+
+def _build_app(db_engine):
+    async def endpoint(request):
+        async with db_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.execute(text("SELECT :value"), {"value": 2})
+        return PlainTextResponse("ok")
+
+    return QueryStatsMiddleware(Starlette(routes=[Route("/", endpoint)]))
+
+
+async def test_server_timing_reports_request_queries(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0)
+    db_engine = create_async_engine("sqlite+aiosqlite://", poolclass=NullPool)
+    instrument_engine(db_engine)
+
+    caplog.set_level(logging.INFO, logger="core.middleware")
+    async with httpx.AsyncClient(transport=ASGITransport(app=_build_app(db_engine)), base_url="http://test") as ac:
+        response = await ac.get("/")
+    await db_engine.dispose()
+
+    assert response.status_code == 200
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+    record = next(r for r in caplog.records if r.name == "core.middleware")
+    assert record.db_queries == 2
+    assert record.status_code == 200
+
+
+async def test_slow_query_logs_statement_and_parameters(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "DB_SLOW_QUERY_MS", 0.000001)
+    db_engine = create_async_engine("sqlite+aiosqlite://", poolclass=NullPool)
+    instrument_engine(db_engine)
+
+    caplog.set_level(logging.WARNING, logger="db.session")
+    async with httpx.AsyncClient(transport=ASGITransport(app=_build_app(db_engine)), base_url="http://test") as ac:
+        await ac.get("/")
+    await db_engine.dispose()
+
+    messages = [r.getMessage() for r in caplog.records if r.name == "db.session"]
+    assert any("SELECT ?" in m and "(2,)" in m for m in messages)
+
+
+async def test_pool_counts_only_checkout_timeouts(tmp_path):
+    db_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    pool = db_engine.sync_engine.pool
+    try:
+        async with db_engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                await db_engine.connect().start()
+        assert pool.timeouts == 1
+
+        broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/pool.db", poolclass=InstrumentedQueuePool)
+        with pytest.raises(exc.OperationalError):
+            await broken.connect().start()
+        assert broken.sync_engine.pool.timeouts == 0
+        await broken.dispose()
+    finally:
+        await db_engine.dispose()
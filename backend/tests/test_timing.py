@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+from services.profiler import request_profiler
+from utils.log import TimingRegistry, timeit, timings
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _divide_by_zero():
+    return 1 / 0
+
+
+async def test_timeit_records_sync_and_async_calls():
+    @timeit(name="test.async_call")
+    async def async_call(value):
+        await asyncio.sleep(0)
+        return value * 2
+
+    @timeit
+    def sync_call(value):
+        return value + 1
+
+    assert await async_call(2) == 4
+    assert sync_call(2) == 3
+    with pytest.raises(ZeroDivisionError):
+        await timeit(name="test.failing")(_divide_by_zero)()
+
+    snapshot = timings.snapshot()
+    assert snapshot["test.async_call"]["count"] == 1
+    assert snapshot[f"{sync_call.__module__}.{sync_call.__qualname__}"]["count"] == 1
+    assert snapshot["test.failing"]["count"] == 1
+
+
+async def test_registry_percentiles():
+    registry = TimingRegistry(window=100)
+    for ms in range(1, 101):
+        registry.record("fn", ms * 1_000_000)
+
+    stats = registry.snapshot()["fn"]
+    assert stats["count"] == 100
+    assert stats["p50_ms"] == 51.0
+    assert stats["p99_ms"] == 100.0
+    assert stats["max_ms"] == 100.0
+
+
+async def test_admin_profiling_samples_matching_requests(client):
+    response = await client.post(
+        "/api/v1/admin/profiling", json={"sample_rate": 1, "path_prefix": "/ping", "max_requests": 1}
+    )
+    assert response.status_code == 200
+    assert response.json()["enabled"] is True
+
+    try:
+        await client.get("/ping")
+        await client.get("/ping")
+
+        response = await client.get("/api/v1/admin/profiling")
+        body = response.json()
+        assert body["status"]["enabled"] is False
+        assert len(body["profiles"]) == 1
+        assert body["profiles"][0]["path"] == "/ping"
+        assert "function calls" in body["profiles"][0]["stats"]
+    finally:
+        await client.delete("/api/v1/admin/profiling")
+    assert request_profiler.collected() == []
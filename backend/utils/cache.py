@@ -0,0 +1,148 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class CacheBackend:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    def _record(self, value: Optional[bytes]) -> Optional[bytes]:
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": type(self).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        super().__init__()
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._record(self._cache.get(key))
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._cache.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._cache.delete(key)
+
+    def stats(self) -> dict:
+        return {**super().stats(), "size": len(self._cache), "maxsize": self._cache.maxsize}
+
+
+class RedisCacheBackend(CacheBackend):
+    def __init__(self, client, ttl: float = 60.0, prefix: str = "cache:"):
+        super().__init__()
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._record(await self.client.get(self.prefix + key))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache get failed for {key}: {e}")
+            return self._record(None)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        try:
+            await self.client.set(self.prefix + key, value, px=int((self.ttl if ttl is None else ttl) * 1000))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache set failed for {key}: {e}")
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        try:
+            await self.client.delete(*(self.prefix + key for key in keys))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache delete failed for {keys}: {e}")
+
+
+def create_cache_backend(redis_url: Optional[str], maxsize: int, ttl: float, prefix: str) -> CacheBackend:
+    if redis_url:
+        from redis.asyncio import Redis
+
+        return RedisCacheBackend(Redis.from_url(redis_url), ttl=ttl, prefix=prefix)
+    return MemoryCacheBackend(maxsize=maxsize, ttl=ttl)
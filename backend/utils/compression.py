@@ -0,0 +1,51 @@
+import gzip
+from typing import Dict, Iterable, Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip is offered
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+# Preferred first when a client weights several encodings equally
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate_encoding(accept_encoding: str, available: Iterable[str] = SUPPORTED_ENCODINGS) -> Optional[str]:
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    return gzip.compress(body, compresslevel=min(level, 9), mtime=0)
+
+
+def precompress(body: bytes, minimum_size: int, level: int) -> Dict[str, bytes]:
+    if len(body) < minimum_size:
+        return {}
+    return {encoding: compress(body, encoding, level) for encoding in SUPPORTED_ENCODINGS}
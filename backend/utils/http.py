@@ -0,0 +1,46 @@
+import hashlib
+
+from fastapi import Request, Response
+from utils.compression import negotiate_encoding
+
+
+def make_etag(*rows) -> str:
+    digest = hashlib.blake2b(digest_size=12)
+    for row in rows:
+        digest.update(f"{type(row).__name__}:{row.id}:{row.updated_at.isoformat()}|".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: W/"x" and "x" name the same representation
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def etag_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
+
+
+def conditional_json_response(
+    request: Request, etag: str, body: bytes, encoded: dict[str, bytes] | None = None
+) -> Response:
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    headers = etag_headers(etag)
+    if encoded:
+        headers["Vary"] = "Accept-Encoding"
+        encoding = negotiate_encoding(request.headers.get("accept-encoding", ""), encoded)
+        if encoding is not None:
+            # Serve the variant compressed when the payload was cached; CompressionMiddleware leaves it alone
+            headers["Content-Encoding"] = encoding
+            body = encoded[encoding]
+    return Response(content=body, media_type="application/json", headers=headers)
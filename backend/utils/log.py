@@ -1,12 +1,102 @@
+import functools
+import inspect
+import logging
+import threading
 import time
+from collections import deque
 
+logger = logging.getLogger(__name__)
 
-def timeit(method):
-    def timed(*args, **kwargs):
-        ts = time.time()
-        result = method(*args, **kwargs)
-        te = time.time()
-        print(f"{method.__name__} took: {te - ts} sec")
-        return result
 
-    return timed
+class TimingHistogram:
+    __slots__ = ("count", "total_ns", "max_ns", "samples")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.samples = deque(maxlen=window)
+
+    def record(self, elapsed_ns: int) -> None:
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.samples.append(elapsed_ns)
+
+    def snapshot(self) -> dict:
+        samples = sorted(self.samples)
+
+        def percentile(q: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(q * len(samples)))] / 1e6, 3)
+
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ns / self.count / 1e6, 3) if self.count else 0.0,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "max_ms": round(self.max_ns / 1e6, 3),
+        }
+
+
+class TimingRegistry:
+    # Percentiles come from the most recent `window` calls; count/mean/max cover the whole process lifetime
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self._histograms: dict[str, TimingHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, TimingHistogram(self.window))
+        histogram.record(elapsed_ns)
+
+    def snapshot(self) -> dict:
+        return {name: histogram.snapshot() for name, histogram in sorted(self._histograms.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+timings = TimingRegistry()
+
+
+def timeit(method=None, *, name: str | None = None):
+    def decorator(func):
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def timed_async(*args, **kwargs):
+                started = time.perf_counter_ns()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    elapsed = time.perf_counter_ns() - started
+                    timings.record(label, elapsed)
+                    logger.debug(f"{label} took {elapsed / 1e6:.3f} ms")
+
+            return timed_async
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            started = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - started
+                timings.record(label, elapsed)
+                logger.debug(f"{label} took {elapsed / 1e6:.3f} ms")
+
+        return timed
+
+    if method is not None:
+        return decorator(method)
+    return decorator